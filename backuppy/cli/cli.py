@@ -2,19 +2,27 @@
 from __future__ import absolute_import
 
 import argparse
-import json
-from logging import Handler, WARNING
+import os
+from functools import partial
+from logging import Handler, NOTSET, WARNING
 
-import yaml
-
-from backuppy import task
 from backuppy.cli.input import ask_any, ask_confirm, ask_option
-from backuppy.config import from_json, from_yaml
-from backuppy.notifier import StdioNotifier
 
 FORMAT_JSON_EXTENSIONS = ('json',)
 FORMAT_YAML_EXTENSIONS = ('yml', 'yaml')
 
+_FORMAT_JSON_SUFFIXES = tuple('.' + extension for extension in FORMAT_JSON_EXTENSIONS)
+_FORMAT_YAML_SUFFIXES = tuple('.' + extension for extension in FORMAT_YAML_EXTENSIONS)
+_FORMAT_JSON_SUFFIXES_LABEL = ', '.join('*' + suffix for suffix in _FORMAT_JSON_SUFFIXES)
+_FORMAT_YAML_SUFFIXES_LABEL = ', '.join('*' + suffix for suffix in _FORMAT_YAML_SUFFIXES)
+
+# Map configuration file extensions to the names of their factories in backuppy.config.
+_CONFIGURATION_FACTORY_NAMES = {
+    '.json': 'from_json',
+    '.yml': 'from_yaml',
+    '.yaml': 'from_yaml',
+}
+
 
 class StdioNotifierLoggingHandler(Handler):
     """Log warnings and more severe records to stdio."""
@@ -22,16 +30,59 @@ class StdioNotifierLoggingHandler(Handler):
     def __init__(self):
         """Initialize a new instance."""
         Handler.__init__(self, WARNING)
-        self._notifier = StdioNotifier()
+        self._notifier = None
 
     def emit(self, record):
         """Log a record.
 
         :param record: logging.LogRecord
         """
+        if self._notifier is None:
+            from backuppy.notifier import StdioNotifier
+
+            self._notifier = StdioNotifier()
         self._notifier.alert(self.format(record))
 
 
+_DEFAULT_LOGGING_HANDLER = StdioNotifierLoggingHandler()
+
+
+def load_configuration(configuration_file_path, verbose=None, interactive=None):
+    """Load a configuration file, and ensure problems are logged.
+
+    :param configuration_file_path: str
+    :param verbose: Optional[bool]
+    :param interactive: Optional[bool]
+    :return: Configuration
+    :raise: ValueError
+    """
+    extension = os.path.splitext(configuration_file_path)[1].lower()
+    configuration_factory_name = _CONFIGURATION_FACTORY_NAMES.get(extension)
+    if configuration_factory_name is None:
+        raise ValueError(
+            'Configuration files must have *.json, *.yml, or *.yaml extensions.')
+    from backuppy import config
+    configuration_factory = getattr(config, configuration_factory_name)
+
+    with open(configuration_file_path, 'rb') as f:
+        configuration = configuration_factory(
+            f, verbose=verbose, interactive=interactive)
+
+    # Ensure at least some form of error logging is enabled.
+    logger = configuration.logger
+    if logger.disabled:
+        logger.disabled = False
+    # Only walk up the logger hierarchy if this logger does not set a level itself.
+    if logger.level > WARNING or (NOTSET == logger.level and logger.getEffectiveLevel() > WARNING):
+        logger.setLevel(WARNING)
+    if not logger.handlers:
+        configuration.notifier.inform(
+            'The configuration does not specify any logging handlers for "backuppy", so all log records about problems will be displayed here.')
+        logger.addHandler(_DEFAULT_LOGGING_HANDLER)
+
+    return configuration
+
+
 class ConfigurationAction(argparse.Action):
     """Provide a configuration file action."""
 
@@ -44,30 +95,9 @@ class ConfigurationAction(argparse.Action):
 
     def __call__(self, parser, namespace, values, option_string=None):
         """Invoke the action."""
-        configuration_file_path = values
-
-        with open(configuration_file_path) as f:
-            if any(map(f.name.endswith, FORMAT_JSON_EXTENSIONS)):
-                configuration_factory = from_json
-            elif any(map(f.name.endswith, FORMAT_YAML_EXTENSIONS)):
-                configuration_factory = from_yaml
-            else:
-                raise ValueError(
-                    'Configuration files must have *.json, *.yml, or *.yaml extensions.')
-            configuration = configuration_factory(
-                f, verbose=namespace.verbose, interactive=namespace.interactive)
-
-            # Ensure at least some form of error logging is enabled.
-            logger = configuration.logger
-            logger.disabled = False
-            if logger.getEffectiveLevel() > WARNING:
-                logger.setLevel(WARNING)
-            if not logger.handlers:
-                configuration.notifier.inform(
-                    'The configuration does not specify any logging handlers for "backuppy", so all log records about problems will be displayed here.')
-                logger.addHandler(StdioNotifierLoggingHandler())
-
-            setattr(namespace, self.dest, configuration)
+        configuration = load_configuration(
+            values, verbose=namespace.verbose, interactive=namespace.interactive)
+        setattr(namespace, self.dest, configuration)
 
 
 class FilePathAction(argparse.Action):
@@ -116,12 +146,10 @@ def add_verbose_to_args(parser):
     :param parser: argparse.ArgumentParser
     :return: argparse.ArgumentParser
     """
-    parser_verbosity = parser.add_mutually_exclusive_group()
-    parser_verbosity.add_argument('-v', '--verbose', dest='verbose', action='store_true',
-                                  help='Generate verbose output. This overrides the value in the configuration file.')
-    parser_verbosity.add_argument('-q', '--quiet', dest='verbose', action='store_false',
-                                  help='Do not generate verbose output. This overrides the value in the configuration file.')
-    parser.set_defaults(verbose=None)
+    parser.add_argument('-v', '--verbose', dest='verbose', action='store_const', const=True, default=None,
+                        help='Generate verbose output. This overrides the value in the configuration file.')
+    parser.add_argument('-q', '--quiet', dest='verbose', action='store_const', const=False,
+                        help='Do not generate verbose output. This overrides the value in the configuration file.')
     return parser
 
 
@@ -153,27 +181,32 @@ def add_path_to_args(parser):
     return parser
 
 
-def add_backup_command_to_parser(parser):
+def add_backup_command_to_parser(parser, stub=False):
     """Add the back-up command to a parser.
 
     :param parser: argparse.ArgumentParser
+    :param stub: bool Whether to register the command's name and help only.
     :return: argparse.ArgumentParser
     """
     backup_parser = parser.add_parser('backup', help='Starts a back-up.')
-    backup_parser.set_defaults(
-        func=lambda parsed_args: task.backup(parsed_args.configuration))
+    if stub:
+        return parser
+    backup_parser.set_defaults(func=_backup)
     add_configuration_to_parser(backup_parser)
     add_path_to_args(backup_parser)
     return parser
 
 
-def add_restore_command_to_parser(parser):
+def add_restore_command_to_parser(parser, stub=False):
     """Add the restore command to a parser.
 
     :param parser: argparse.ArgumentParser
+    :param stub: bool Whether to register the command's name and help only.
     :return: argparse.ArgumentParser
     """
     restore_parser = parser.add_parser('restore', help='Restores a back-up.')
+    if stub:
+        return parser
     restore_parser.set_defaults(func=lambda parsed_args: restore(
         parsed_args.configuration, parsed_args.path))
     add_configuration_to_parser(restore_parser)
@@ -181,28 +214,41 @@ def add_restore_command_to_parser(parser):
     return parser
 
 
-def add_init_command_to_parser(parser):
+def add_init_command_to_parser(parser, stub=False):
     """Add the configuration initialization command to a parser.
 
     :param parser: argparse.ArgumentParser
+    :param stub: bool Whether to register the command's name and help only.
     :return: argparse.ArgumentParser
     """
     init_parser = parser.add_parser(
         'init', help='Initializes a new back-up configuration.')
+    if stub:
+        return parser
     init_parser.set_defaults(func=lambda parsed_args: init())
     return parser
 
 
-def add_commands_to_parser(parser):
+COMMANDS = (
+    ('backup', add_backup_command_to_parser),
+    ('restore', add_restore_command_to_parser),
+    ('init', add_init_command_to_parser),
+)
+
+_COMMAND_NAMES = frozenset(command_name for command_name, _ in COMMANDS)
+
+
+def add_commands_to_parser(parser, command=None):
     """Add Backuppy commands to a parser.
 
     :param parser: argparse.ArgumentParser
+    :param command: Optional[str] The name of the only command to fully set up, or None to set up all commands.
     :return: argparse.ArgumentParser
     """
     subparsers = parser.add_subparsers()
-    add_backup_command_to_parser(subparsers)
-    add_restore_command_to_parser(subparsers)
-    add_init_command_to_parser(subparsers)
+    for command_name, add_command_to_parser in COMMANDS:
+        add_command_to_parser(subparsers, stub=command not in (
+            None, command_name))
     return parser
 
 
@@ -252,16 +298,27 @@ def init():
         configuration_data['name'] = name
 
     if 'json' == format:
-        file_path_extensions = FORMAT_JSON_EXTENSIONS
-        formatter = json.dumps
+        import json
+
+        file_path_suffixes = _FORMAT_JSON_SUFFIXES
+        file_path_extensions_label = _FORMAT_JSON_SUFFIXES_LABEL
+
+        def formatter(data):
+            return json.dumps(data).encode('utf-8')
     else:
-        file_path_extensions = FORMAT_YAML_EXTENSIONS
-        formatter = yaml.dump
-    file_path_extensions_label = ', '.join(
-        map(lambda x: '*.' + x, file_path_extensions))
+        import yaml
+        try:
+            from yaml import CSafeDumper
+        except ImportError:
+            from yaml import SafeDumper as CSafeDumper
+
+        file_path_suffixes = _FORMAT_YAML_SUFFIXES
+        file_path_extensions_label = _FORMAT_YAML_SUFFIXES_LABEL
+        formatter = partial(
+            yaml.dump, Dumper=CSafeDumper, encoding='utf-8')
 
     def _file_path_validator(path):
-        if not any(map(path.endswith, file_path_extensions)):
+        if not path.endswith(file_path_suffixes):
             raise ValueError(
                 'Configuration files must have %s extensions.' % file_path_extensions_label)
         return path
@@ -272,7 +329,7 @@ def init():
                                           question='Where should backuppy store your new configuration file?',
                                           validator=_file_path_validator)
         try:
-            with open(configuration_file_path, mode='w+t') as f:
+            with open(configuration_file_path, mode='wb') as f:
                 f.write(formatter(configuration_data))
             saved = True
         except BaseException as e:
@@ -281,6 +338,17 @@ def init():
         'Your new back-up configuration has been saved. Start backing up your data by running the following command: backuppy -c %s' % configuration_file_path)
 
 
+def backup(configuration):
+    """Handle the back-up command.
+
+    :param configuration: Configuration
+    :return: bool
+    """
+    from backuppy import task
+
+    return task.backup(configuration)
+
+
 def restore(configuration, path=''):
     """Handle the back-up restoration command.
 
@@ -294,21 +362,47 @@ def restore(configuration, path=''):
         configuration.notifier.confirm('Aborting back-up restoration...')
         return True
 
+    from backuppy import task
+
     task.restore(configuration, path)
 
 
+def _backup(parsed_args):
+    """Handle the back-up command for parsed CLI arguments.
+
+    :param parsed_args: argparse.Namespace
+    """
+    backup(parsed_args.configuration)
+
+
+def _parse_backup_args(args):
+    """Parse the arguments for the most common back-up invocation without building a full argument parser.
+
+    :param args: List[str]
+    :return: Optional[argparse.Namespace]
+    """
+    if 3 != len(args) or 'backup' != args[0] or args[1] not in ('-c', '--configuration') or args[2].startswith('-'):
+        return None
+    return argparse.Namespace(func=_backup, configuration=load_configuration(args[2]), path=None)
+
+
 def main(args):
     """Provide the CLI entry point."""
-    parser = argparse.ArgumentParser(
-        description='Backuppy backs up and restores your data using rsync.')
-    add_commands_to_parser(parser)
-
-    # In Python 2.7, --help is not invoked when no subcommand is given, so we mimic the Python 3 behavior in a
-    # cross-platform way by invoking the help explicitly if no CLI arguments have been given.
-    if not args:
-        parser.print_help()
-        return
-    parsed_args = parser.parse_args(args)
+    # Scheduled back-ups typically run `backuppy backup -c FILE`, which does not require the full argument parser.
+    parsed_args = _parse_backup_args(args)
+    if parsed_args is None:
+        parser = argparse.ArgumentParser(
+            description='Backuppy backs up and restores your data using rsync.')
+        # Only set up the arguments for the command that is being invoked, if we know which one it is.
+        command = args[0] if args and args[0] in _COMMAND_NAMES else None
+        add_commands_to_parser(parser, command)
+
+        # In Python 2.7, --help is not invoked when no subcommand is given, so we mimic the Python 3 behavior in a
+        # cross-platform way by invoking the help explicitly if no CLI arguments have been given.
+        if not args:
+            parser.print_help()
+            return
+        parsed_args = parser.parse_args(args)
     try:
         parsed_args.func(parsed_args)
     except KeyboardInterrupt:
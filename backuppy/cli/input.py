@@ -1,5 +1,16 @@
 """Parse command-line input."""
-import re
+
+
+def _prompt(prompt, question=None):
+    """Build a prompt, preceded by a question on its own line if there is one.
+
+    :param prompt: str
+    :param question: Optional[str]
+    :return: str
+    """
+    if question is None:
+        return prompt
+    return '%s\n%s' % (question, prompt)
 
 
 def _input(prompt=None):
@@ -28,12 +39,10 @@ def ask_confirm(value_label, question=None, default=None):
         options_label = '[Y/n]'
     else:
         options_label = '[y/N]'
+    prompt = _prompt('%s %s: ' % (value_label, options_label), question)
     confirmation = None
     while confirmation is None:
-        if question is not None:
-            print(question)
-        confirmation_input = _input('%s %s: ' % (
-            value_label, options_label)).lower()
+        confirmation_input = _input(prompt).lower()
         if 'y' == confirmation_input:
             confirmation = True
         elif 'n' == confirmation_input:
@@ -54,11 +63,10 @@ def ask_any(value_label, question=None, required=True, validator=None):
     :param validator: Optional[Callable]
     :return: bool
     """
+    prompt = _prompt(value_label + ': ', question)
     string = None
     while string is None:
-        if question is not None:
-            print(question)
-        string_input = _input(value_label + ': ')
+        string_input = _input(prompt)
         if validator:
             string = validator(string_input)
         elif not required or len(string_input):
@@ -76,26 +84,24 @@ def ask_option(value_label, options, question=None):
     :param question: Optional[None]
     :return: bool
     """
+    options = list(options)
     if len(options) == 1:
         return options[0][0]
 
     option = None
-    options_labels = []
-    indexed_options = [(index, value, label)
-                       for index, (value, label) in enumerate(options)]
-    for index, _, option_label in indexed_options:
-        options_labels.append('%d) %s' % (index, option_label))
+    options_labels = '\n'.join(['%d) %s' % (index, option_label)
+                                for index, (_, option_label) in enumerate(options)])
     options_label = '0-%d' % (len(options) - 1)
+    prompt = '%s (%s): ' % (value_label, options_label)
+    if question is not None:
+        prompt = _prompt(prompt, '%s\n%s' % (question, options_labels))
     while option is None:
-        if question is not None:
-            print(question)
-            print('\n'.join(options_labels))
-        option_input = _input('%s (%s): ' % (value_label, options_label))
+        option_input = _input(prompt)
         try:
-            if re.search('^\d+$', option_input) is None:
+            if not option_input.isdigit():
                 raise IndexError()
             index_input = int(option_input)
-            option = indexed_options[index_input][1]
-        except IndexError:
+            option = options[index_input][0]
+        except (IndexError, ValueError):
             print('That is not a valid option. Enter %s.' % options_label)
     return option
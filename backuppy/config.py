@@ -1,11 +1,29 @@
 """Provides configuration components."""
-import json
 import logging
 import os
 from logging import config as logging_config
 
 import yaml
 
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader
+
+try:
+    from msgspec.json import decode as _json_loads
+except ImportError:
+    try:
+        from orjson import loads as _json_loads
+    except ImportError:
+        import json
+
+        def _json_loads(data):
+            # Python 3.5's json.loads() does not accept bytes.
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+            return json.loads(data)
+
 from backuppy.location import Source, Target, SshOptionsProvider
 from backuppy.notifier import GroupedNotifiers, Notifier, QuietNotifier
 from backuppy.plugin import new_source, new_target, new_notifier
@@ -14,6 +32,9 @@ from backuppy.plugin import new_source, new_target, new_notifier
 class Configuration(SshOptionsProvider):
     """Provides back-up configuration."""
 
+    __slots__ = ('_name', '_working_directory', '_verbose', '_interactive', '_source', '_target', '_notifier',
+                 '_logger')
+
     def __init__(self, name, working_directory=None, verbose=False, interactive=False):
         """Initialize a new instance.
 
@@ -163,6 +184,22 @@ class Configuration(SshOptionsProvider):
         return ssh_location.ssh_options()
 
 
+def _parse_plugin_data(plugin_data, label):
+    """Parse a plugin's type and configuration from raw, built-in types such as dictionaries, lists, and scalars.
+
+    :param plugin_data: Optional[dict]
+    :param label: str The plugin's location in the configuration, for use in error messages.
+    :return: Tuple[str, Optional[dict]]
+    :raise: ValueError
+    """
+    if plugin_data is None:
+        raise ValueError('`%s` is required.' % label)
+    plugin_type = plugin_data.get('type')
+    if plugin_type is None:
+        raise ValueError('`%s[type]` is required.' % label)
+    return plugin_type, plugin_data.get('configuration')
+
+
 def from_configuration_data(configuration_file_path, data, verbose=None, interactive=None):
     """Parse configuration from raw, built-in types such as dictionaries, lists, and scalars.
 
@@ -173,54 +210,39 @@ def from_configuration_data(configuration_file_path, data, verbose=None, interac
     :return: cls
     :raise: ValueError
     """
-    name = data['name'] if 'name' in data else configuration_file_path
+    name = data.get('name', configuration_file_path)
     working_directory = os.path.dirname(configuration_file_path)
 
-    if verbose is None and 'verbose' in data:
-        if not isinstance(data['verbose'], bool):
+    if verbose is None:
+        verbose = data.get('verbose')
+        if verbose is not None and not isinstance(verbose, bool):
             raise ValueError('`verbose` must be a boolean.')
-        verbose = data['verbose']
 
     if interactive is None:
-        interactive = True
-        if 'interactive' in data:
-            if not isinstance(data['interactive'], bool):
-                raise ValueError('`interactive` must be a boolean.')
-            interactive = data['interactive']
+        interactive = data.get('interactive', True)
+        if not isinstance(interactive, bool):
+            raise ValueError('`interactive` must be a boolean.')
 
     configuration = Configuration(
         name, working_directory, verbose, interactive)
 
-    if 'logging' in data:
-        logging_config.dictConfig(data['logging'])
+    logging_data = data.get('logging')
+    if logging_data is not None:
+        logging_config.dictConfig(logging_data)
 
     notifier = GroupedNotifiers()
-    if 'notifications' in data:
-        for notifier_data in data['notifications']:
-            if 'type' not in notifier_data:
-                raise ValueError('`notifiers[][type]` is required.')
-            notifier_configuration = notifier_data['configuration'] if 'configuration' in notifier_data else None
-            notifier.notifiers.append(new_notifier(
-                configuration, notifier_data['type'], notifier_configuration))
+    for notifier_data in data.get('notifications', ()):
+        notifier.notifiers.append(new_notifier(
+            configuration, *_parse_plugin_data(notifier_data, 'notifiers[]')))
     if not configuration.verbose:
         notifier = QuietNotifier(notifier)
     configuration.notifier = notifier
 
-    if 'source' not in data:
-        raise ValueError('`source` is required.')
-    if 'type' not in data['source']:
-        raise ValueError('`source[type]` is required.')
-    source_configuration = data['source']['configuration'] if 'configuration' in data['source'] else None
     configuration.source = new_source(
-        configuration, data['source']['type'], source_configuration)
+        configuration, *_parse_plugin_data(data.get('source'), 'source'))
 
-    if 'target' not in data:
-        raise ValueError('`target` is required.')
-    if 'type' not in data['target']:
-        raise ValueError('`target[type]` is required.')
-    target_configuration = data['target']['configuration'] if 'configuration' in data['target'] else None
     configuration.target = new_target(
-        configuration, data['target']['type'], target_configuration)
+        configuration, *_parse_plugin_data(data.get('target'), 'target'))
 
     return configuration
 
@@ -228,20 +250,23 @@ def from_configuration_data(configuration_file_path, data, verbose=None, interac
 def from_json(f, verbose=None, interactive=None):
     """Parse configuration from a JSON file.
 
-    :param f: File
+    :param f: File The file, opened in binary or text mode.
     :param verbose: Optional[bool]
     :param interactive: Optional[bool]
     :return: Configuration
     """
-    return from_configuration_data(f.name, json.load(f), verbose=verbose, interactive=interactive)
+    # Read the entire file at once, so the parser can work on a single in-memory buffer.
+    return from_configuration_data(f.name, _json_loads(f.read()), verbose=verbose, interactive=interactive)
 
 
 def from_yaml(f, verbose=None, interactive=None):
     """Parse configuration from a YAML file.
 
-    :param f: File
+    :param f: File The file, opened in binary or text mode.
     :param verbose: Optional[bool]
     :param interactive: Optional[bool]
     :return: Configuration
     """
-    return from_configuration_data(f.name, yaml.load(f), verbose=verbose, interactive=interactive)
+    # Read the entire file at once, so the parser can work on a single in-memory buffer.
+    data = yaml.load(f.read(), Loader=CSafeLoader)
+    return from_configuration_data(f.name, data, verbose=verbose, interactive=interactive)
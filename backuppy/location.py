@@ -1,22 +1,28 @@
 """Provide back-up locations."""
 import os
-import socket
 import subprocess
+import threading
 from binascii import b2a_hex
-from time import strftime, gmtime
-
-import paramiko
-from paramiko import SSHException, RejectPolicy
+from time import gmtime
 
 from backuppy.cli.input import ask_confirm
 
+try:
+    from shlex import quote
+except ImportError:
+    from pipes import quote
+
+
+# Equivalent to the strftime() format '%Y-%m-%d_%H-%M-%S_UTC', without the overhead of strftime().
+_SNAPSHOT_NAME_FORMAT = '%04d-%02d-%02d_%02d-%02d-%02d_UTC'
+
 
 def new_snapshot_name():
     """Build the name for a new back-up snapshot.
 
     :return: str
     """
-    return strftime('%Y-%m-%d_%H-%M-%S_UTC', gmtime())
+    return _SNAPSHOT_NAME_FORMAT % gmtime()[:6]
 
 
 def _new_snapshot_args(name):
@@ -39,9 +45,97 @@ def _new_snapshot_args(name):
     ]
 
 
+def _to_snapshot_script_command(args):
+    """Convert cli arguments to a command in the snapshot script, without nesting shells.
+
+    :param args: Iterable[str]
+    :return: str
+    """
+    if args[:2] == ['bash', '-c']:
+        return args[2]
+    return ' '.join([quote(arg) for arg in args])
+
+
+# Build the snapshot script and command once, so individual snapshots only need to fill in their names.
+_SNAPSHOT_SCRIPT_TEMPLATE = ' && '.join(
+    [_to_snapshot_script_command(args) for args in _new_snapshot_args('{name}')])
+_SNAPSHOT_COMMAND_TEMPLATE = 'bash -c %s' % quote(_SNAPSHOT_SCRIPT_TEMPLATE)
+
+
+def _new_snapshot_script(name):
+    """Build a single bash script to create a back-up snapshot.
+
+    :return: str
+    """
+    return _SNAPSHOT_SCRIPT_TEMPLATE.format(name=name)
+
+
+def _new_snapshot_command(name):
+    """Build a single shell command to create a back-up snapshot.
+
+    :return: str
+    """
+    return _SNAPSHOT_COMMAND_TEMPLATE.format(name=name)
+
+
+def _new_snapshots_script(names):
+    """Build a single bash script to create several back-up snapshots, in order.
+
+    :param names: Iterable[str]
+    :return: str
+    """
+    return ' && '.join([_new_snapshot_script(name) for name in names])
+
+
+# SSH clients shared by all SSH locations that connect to the same remote, keyed by SshLocation._client_key().
+_SSH_CLIENTS = {}
+# Locks held while connecting to a remote, so concurrent connections to the same remote share a single client, while
+# connections to different remotes do not wait for each other. Keyed like _SSH_CLIENTS.
+_SSH_CLIENT_LOCKS = {}
+# Guards _SSH_CLIENTS and _SSH_CLIENT_LOCKS themselves.
+_SSH_CLIENTS_LOCK = threading.Lock()
+
+
+def _ssh_client_lock(key):
+    """Get the lock to hold while connecting to a remote.
+
+    :param key: Tuple
+    :return: threading.Lock
+    """
+    with _SSH_CLIENTS_LOCK:
+        lock = _SSH_CLIENT_LOCKS.get(key)
+        if lock is None:
+            lock = _SSH_CLIENT_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def close_ssh_clients():
+    """Close all shared SSH connections."""
+    with _SSH_CLIENTS_LOCK:
+        clients = list(_SSH_CLIENTS.values())
+        _SSH_CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+def _check_availability(results, index, location):
+    """Check a location's availability, and store the result.
+
+    :param results: List[Union[Tuple[bool, Optional[str]], Exception]]
+    :param index: int The index in results at which to store the result, or the error raised while checking.
+    :param location: Location
+    """
+    try:
+        results[index] = location.check_availability()
+    except Exception as e:
+        results[index] = e
+
+
 class SshOptionsProvider(object):
     """Provide SSH options."""
 
+    __slots__ = ()
+
     def ssh_options(self):
         """Build SSH options.
 
@@ -55,6 +149,8 @@ class SshOptionsProvider(object):
 class Location(object):
     """Provide a backup location."""
 
+    __slots__ = ()
+
     def is_available(self):
         """Check if the target is available.
 
@@ -62,6 +158,13 @@ class Location(object):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def check_availability(self):
+        """Check if the target is available, without notifying anyone of problems.
+
+        :return: Tuple[bool, Optional[str]] Whether the target is available, and the problem if it is not.
+        """
+        return self.is_available(), None
+
     def to_rsync(self):
         """Build this location's rsync path.
 
@@ -69,16 +172,22 @@ class Location(object):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def close(self):
+        """Release any resources, such as connections, held by this location."""
+        pass
+
 
 class Source(Location):
     """Provide a backup source."""
 
-    pass
+    __slots__ = ()
 
 
 class Target(Location):
     """Provide a backup target."""
 
+    __slots__ = ()
+
     def snapshot(self, name):
         """Create a new snapshot.
 
@@ -86,10 +195,20 @@ class Target(Location):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def snapshot_many(self, names):
+        """Create several new snapshots, in order.
+
+        :param names: Iterable[str]
+        """
+        for name in names:
+            self.snapshot(name)
+
 
 class PathLocation(Location):
     """Provide a local, path-based backup location."""
 
+    __slots__ = ('_logger', '_notifier', '_path', '_rsync_path')
+
     def __init__(self, logger, notifier, path):
         """Initialize a new instance.
 
@@ -100,17 +219,28 @@ class PathLocation(Location):
         self._logger = logger
         self._notifier = notifier
         self._path = path
+        self._rsync_path = None
 
     def is_available(self):
         """Check if the target is available.
 
         :return: bool
         """
-        if os.path.exists(self.path):
-            return True
-        message = 'Path `%s` does not exist.' % self._path
-        self._logger.debug(message)
-        self._notifier.alert(message)
+        available, problem = self.check_availability()
+        if problem is not None:
+            self._notifier.alert(problem)
+        return available
+
+    def check_availability(self):
+        """Check if the target is available, without notifying anyone of problems.
+
+        :return: Tuple[bool, Optional[str]] Whether the target is available, and the problem if it is not.
+        """
+        if os.path.exists(self._path):
+            return True, None
+        problem = 'Path `%s` does not exist.' % self._path
+        self._logger.debug(problem)
+        return False, problem
 
     @property
     def path(self):
@@ -124,6 +254,8 @@ class PathLocation(Location):
 class PathSource(Source, PathLocation):
     """Provide a local, path-based back-up source."""
 
+    __slots__ = ()
+
     def to_rsync(self):
         """Build this location's rsync path.
 
@@ -135,26 +267,99 @@ class PathSource(Source, PathLocation):
 class PathTarget(Target, PathLocation):
     """Provide a local, path-based back-up target."""
 
+    __slots__ = ()
+
     def to_rsync(self):
         """Build this location's rsync path.
 
         :return: str
         """
-        return '%s/%s' % (self._path.rstrip('/'), 'latest/')
+        if self._rsync_path is None:
+            self._rsync_path = '%s/%s' % (self._path.rstrip('/'), 'latest/')
+        return self._rsync_path
 
     def snapshot(self, name):
         """Create a new snapshot.
 
         :param name: str
         """
-        for args in _new_snapshot_args(name):
-            subprocess.check_call(args, cwd=self._path)
+        subprocess.check_call(
+            ['bash', '-c', _new_snapshot_script(name)], cwd=self._path)
 
+    def snapshot_many(self, names):
+        """Create several new snapshots, in order.
 
-class AskPolicy(RejectPolicy):
-    """An SSH missing host key policy that interactively asks users whether to accept the key."""
+        :param names: Iterable[str]
+        """
+        subprocess.check_call(
+            ['bash', '-c', _new_snapshots_script(names)], cwd=self._path)
+
+
+# The number of seconds to wait for a remote to accept a TCP connection, before attempting the slower SSH handshake.
+_PROBE_TIMEOUT = 1
+
+_CONNECTION_ERRORS = None
+
+
+def _connection_errors():
+    """Get the errors that mean a remote cannot be reached.
+
+    Only these are treated as unavailability, so that local problems, such as a missing identity file, still surface as
+    errors. The errors are collected once, and paramiko is only imported when needed.
+
+    :return: Tuple[type]
+    """
+    global _CONNECTION_ERRORS
+    if _CONNECTION_ERRORS is None:
+        import socket
+
+        from paramiko.ssh_exception import NoValidConnectionsError
+
+        connection_errors = (socket.gaierror, NoValidConnectionsError)
+        try:
+            connection_errors += (ConnectionError,)
+        except NameError:
+            # Python 2 has no ConnectionError.
+            pass
+        _CONNECTION_ERRORS = connection_errors
+    return _CONNECTION_ERRORS
+
+
+# Locations may connect concurrently, so make sure users are asked about a single host key at a time.
+_ASK_POLICY_LOCK = threading.Lock()
+
+_REJECT_POLICY = None
+
+
+def _reject_policy():
+    """Get the shared paramiko.RejectPolicy.
+
+    Missing host key policies are stateless, so one instance can be shared, and paramiko is only imported when needed.
+
+    :return: paramiko.RejectPolicy
+    """
+    global _REJECT_POLICY
+    if _REJECT_POLICY is None:
+        from paramiko import RejectPolicy
+
+        _REJECT_POLICY = RejectPolicy()
+    return _REJECT_POLICY
+
+
+class AskPolicy(object):
+    """An SSH missing host key policy that interactively asks users whether to accept the key.
+
+    This implements paramiko.MissingHostKeyPolicy without extending it, so paramiko is only imported when needed.
+    """
+
+    __slots__ = ()
 
     def missing_host_key(self, client, hostname, key):
+        """Handle a missing host key."""
+        with _ASK_POLICY_LOCK:
+            self._missing_host_key(client, hostname, key)
+
+    def _missing_host_key(self, client, hostname, key):
         """Handle a missing host key."""
         fingerprint = b2a_hex(key.get_fingerprint()).decode('utf-8')
         fingerprint_label = ':'.join(
@@ -163,13 +368,20 @@ class AskPolicy(RejectPolicy):
                           'Do you want to connect to previously unknown host %s using %s key %s?\nThe fact that this host is unknown can mean you have never connected to it before, its SSH server has been reconfigured, or it has been compromised.' % (
                               hostname, key.get_name(), fingerprint_label), False)
         if not add:
-            RejectPolicy.missing_host_key(self, client, hostname, key)
+            _reject_policy().missing_host_key(client, hostname, key)
+
+
+_ASK_POLICY = AskPolicy()
 
 
 class SshLocation(Location, SshOptionsProvider):
     """Provide a target over SSH."""
 
-    def __init__(self, notifier, user, host, path, port=22, identity=None, host_keys=None, interactive=False):
+    __slots__ = ('_notifier', '_user', '_host', '_port', '_path', '_identity', '_host_keys', '_interactive',
+                 '_keepalive_interval', '_rsync_path')
+
+    def __init__(self, notifier, user, host, path, port=22, identity=None, host_keys=None, interactive=False,
+                 keepalive_interval=30):
         """Initialize a new instance.
 
         :param user: str
@@ -179,6 +391,7 @@ class SshLocation(Location, SshOptionsProvider):
         :param identity: Optional[str]
         :param host_keys: Optional[str]
         :param interactive: bool
+        :param keepalive_interval: int The number of seconds between keepalive packets, or 0 to disable them.
         """
         self._notifier = notifier
         self._user = user
@@ -188,44 +401,134 @@ class SshLocation(Location, SshOptionsProvider):
         self._identity = identity
         self._host_keys = host_keys
         self._interactive = interactive
+        self._keepalive_interval = keepalive_interval
+        self._rsync_path = None
 
     def is_available(self):
         """Check if the target is available.
 
         :return: bool
         """
+        available, problem = self.check_availability()
+        if problem is not None:
+            self._notifier.alert(problem)
+        return available
+
+    def check_availability(self):
+        """Check if the target is available, without notifying anyone of problems.
+
+        :return: Tuple[bool, Optional[str]] Whether the target is available, and the problem if it is not.
+        """
+        import socket
+
+        from paramiko import SSHException
+
         try:
-            with self._connect():
-                return True
+            self._connect()
+            return True, None
         except SSHException as e:
-            self._notifier.alert(
-                'Could not establish an SSH connection to the remote: %s.' % str(e))
-            return False
+            return False, 'Could not establish an SSH connection to the remote: %s.' % str(e)
         except socket.timeout:
-            self._notifier.alert('The remote timed out.')
-            return False
+            return False, 'The remote timed out.'
+        except _connection_errors() as e:
+            return False, 'The remote is unreachable: %s.' % str(e)
+
+    def _client_key(self):
+        """Build the key under which this location's SSH client is shared.
+
+        :return: Tuple
+        """
+        return self._user, self._host, self._port, self._identity, self._host_keys
 
     def _connect(self):
+        """Connect to the remote, reusing an existing connection to the same remote if it is still active.
+
+        :return: paramiko.SSHClient
+        """
+        key = self._client_key()
+        with _ssh_client_lock(key):
+            with _SSH_CLIENTS_LOCK:
+                client = _SSH_CLIENTS.get(key)
+            if client is not None:
+                transport = client.get_transport()
+                if transport is not None and transport.is_active():
+                    return client
+                with _SSH_CLIENTS_LOCK:
+                    del _SSH_CLIENTS[key]
+                client.close()
+
+            client = self._new_client()
+            with _SSH_CLIENTS_LOCK:
+                _SSH_CLIENTS[key] = client
+            return client
+
+    def _new_client(self):
         """Connect to the remote.
 
         :return: paramiko.SSHClient
         """
+        import paramiko
+
+        self._probe()
         client = paramiko.SSHClient()
         client.load_system_host_keys()
         if self._host_keys:
             client.load_host_keys(self._host_keys)
         if self._interactive:
-            client.set_missing_host_key_policy(AskPolicy())
+            client.set_missing_host_key_policy(_ASK_POLICY)
         else:
-            client.set_missing_host_key_policy(RejectPolicy())
+            client.set_missing_host_key_policy(_reject_policy())
         connect_args = {}
         if self._identity:
             connect_args['look_for_keys'] = False
             connect_args['key_filename'] = self._identity
         client.connect(self._host, self._port, self._user,
                        timeout=9, **connect_args)
+        self._configure_transport(client.get_transport())
         return client
 
+    def _probe(self):
+        """Check that the remote accepts TCP connections, so unreachable remotes fail fast.
+
+        :raise: socket.timeout
+        :raise: socket.gaierror
+        :raise: paramiko.ssh_exception.NoValidConnectionsError
+        """
+        import socket
+
+        from paramiko.ssh_exception import NoValidConnectionsError
+
+        try:
+            socket.create_connection((self._host, self._port), _PROBE_TIMEOUT).close()
+        except (socket.timeout, socket.gaierror):
+            raise
+        except socket.error as e:
+            raise NoValidConnectionsError({(self._host, self._port): e})
+
+    def _configure_transport(self, transport):
+        """Configure a connection's transport, so the connection can be reused for longer and responds faster.
+
+        :param transport: paramiko.Transport
+        """
+        import socket
+
+        # Keep idle connections from being dropped by firewalls and NAT gateways.
+        transport.set_keepalive(self._keepalive_interval)
+        if isinstance(transport.sock, socket.socket):
+            transport.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Snapshot commands are short, so send them immediately, rather than wait to combine them with more data.
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def close(self):
+        """Close the connection to the remote, if there is one."""
+        key = self._client_key()
+        # Wait for any connection in progress, so it cannot be stored after this location was closed.
+        with _ssh_client_lock(key):
+            with _SSH_CLIENTS_LOCK:
+                client = _SSH_CLIENTS.pop(key, None)
+        if client is not None:
+            client.close()
+
     @property
     def path(self):
         """Get the location's absolute file path on the remote host.
@@ -273,44 +576,76 @@ class SshLocation(Location, SshOptionsProvider):
 class SshSource(Source, SshLocation):
     """Provide a source over SSH."""
 
+    __slots__ = ()
+
     def to_rsync(self):
         """Build this location's rsync path.
 
         :return: str
         """
-        return '%s@%s:%s/' % (self.user, self.host, self._path.rstrip('/'))
+        if self._rsync_path is None:
+            self._rsync_path = '%s@%s:%s/' % (self.user, self.host, self._path.rstrip('/'))
+        return self._rsync_path
 
 
 class SshTarget(Target, SshLocation):
     """Provide a target over SSH."""
 
+    __slots__ = ()
+
     def snapshot(self, name):
         """Create a new snapshot.
 
         :param name: str
         """
-        with self._connect() as client:
-            for args in _new_snapshot_args(name):
-                client.exec_command(' '.join(args))
+        self._exec_command(_new_snapshot_command(name))
+
+    def snapshot_many(self, names):
+        """Create several new snapshots, in order.
+
+        :param names: Iterable[str]
+        """
+        self._exec_command('bash -c %s' % quote(_new_snapshots_script(names)))
+
+    def _exec_command(self, command):
+        """Execute a shell command on the remote.
+
+        :param command: str
+        :raise: subprocess.CalledProcessError
+        """
+        _, stdout, _ = self._connect().exec_command(command)
+        # Drain all output before waiting for the command to exit, so the remote never blocks on a full channel.
+        stdout.channel.set_combine_stderr(True)
+        output = stdout.read()
+        exit_status = stdout.channel.recv_exit_status()
+        if exit_status:
+            raise subprocess.CalledProcessError(exit_status, command, output)
 
     def to_rsync(self):
         """Build this location's rsync path.
 
         :return: str
         """
-        return '%s@%s:%s/latest/' % (self.user, self.host, self._path.rstrip('/'))
+        if self._rsync_path is None:
+            self._rsync_path = '%s@%s:%s/latest/' % (self.user, self.host, self._path.rstrip('/'))
+        return self._rsync_path
 
 
 class FirstAvailableTarget(Target):
     """A target that decorates the first available of the given targets."""
 
-    def __init__(self, targets):
+    __slots__ = ('_notifier', '_targets', '_available_target', '_probes')
+
+    def __init__(self, notifier, targets):
         """Initialize a new instance.
 
+        :param notifier: Notifier
         :param targets: Iterable[Target]
         """
-        self._targets = targets
+        self._notifier = notifier
+        self._targets = tuple(targets)
         self._available_target = None
+        self._probes = []
 
     def is_available(self):
         """Check if the target is available.
@@ -333,6 +668,21 @@ class FirstAvailableTarget(Target):
         """
         return self._get_available_target().snapshot(name)
 
+    def snapshot_many(self, names):
+        """Create several new snapshots, in order.
+
+        :param names: Iterable[str]
+        """
+        return self._get_available_target().snapshot_many(names)
+
+    def close(self):
+        """Release any resources, such as connections, held by this location."""
+        # Wait for the targets that are still being checked, so they cannot connect after they were closed.
+        for probe in self._probes:
+            probe.join()
+        for target in self._targets:
+            target.close()
+
     def _get_available_target(self):
         """Get the first available target.
 
@@ -341,7 +691,23 @@ class FirstAvailableTarget(Target):
         if self._available_target is not None:
             return self._available_target
 
-        for target in self._targets:
-            if target.is_available():
-                self._available_target = target
-                return target
+        # Check all targets concurrently, so unavailable targets that time out do so in parallel rather than in
+        # sequence. The targets' order still determines which of the available targets is used, and only the problems
+        # of the targets before it are reported, because the targets after it are never needed.
+        results = [None] * len(self._targets)
+        self._probes = []
+        for index, target in enumerate(self._targets):
+            probe = threading.Thread(target=_check_availability, args=(results, index, target))
+            probe.daemon = True
+            probe.start()
+            self._probes.append(probe)
+        for index, probe in enumerate(self._probes):
+            probe.join()
+            if isinstance(results[index], Exception):
+                raise results[index]
+            available, problem = results[index]
+            if available:
+                self._available_target = self._targets[index]
+                return self._available_target
+            if problem is not None:
+                self._notifier.alert(problem)
@@ -1,8 +1,16 @@
 """Provide notifications."""
 from __future__ import print_function
 
+import logging
+import os
 import subprocess
 import sys
+import threading
+
+try:
+    from subprocess import DEVNULL as _DEVNULL
+except ImportError:
+    _DEVNULL = open(os.devnull, 'r+b')
 
 
 class Notifier(object):
@@ -88,6 +96,27 @@ class GroupedNotifiers(Notifier):
             notifier.alert(message)
 
 
+def _compile_command_args(args):
+    """Mark which of a notification command's arguments contain the message placeholder.
+
+    :param args: Iterable[str]
+    :return: List[Tuple[str, bool]]
+    """
+    return [(arg, '{message}' in arg) for arg in args]
+
+
+def _reap(process, args):
+    """Wait for a notification command to finish, so it does not linger as a zombie, and log it if it failed.
+
+    :param process: subprocess.Popen
+    :param args: List[str]
+    """
+    exit_status = process.wait()
+    if exit_status:
+        logging.getLogger('backuppy').warning(
+            'Notification command `%s` exited with status %s.' % (' '.join(args), exit_status))
+
+
 class CommandNotifier(Notifier):
     """Send notifications as shell commands using a subprocess."""
 
@@ -103,22 +132,25 @@ class CommandNotifier(Notifier):
         if None in [state_args, inform_args, confirm_args, alert_args] and fallback_args is None:
             raise ValueError(
                 'fallback_args must be given if one or more of the other arguments are omitted.')
-        self._state_args = state_args
-        self._inform_args = inform_args
-        self._confirm_args = confirm_args
-        self._alert_args = alert_args
-        self._fallback_args = fallback_args
+        # Resolve the fallback and find the message placeholders once, so notifications do not have to.
+        self._state_args = _compile_command_args(state_args if state_args is not None else fallback_args)
+        self._inform_args = _compile_command_args(inform_args if inform_args is not None else fallback_args)
+        self._confirm_args = _compile_command_args(confirm_args if confirm_args is not None else fallback_args)
+        self._alert_args = _compile_command_args(alert_args if alert_args is not None else fallback_args)
 
     def _call(self, args, message):
         """Send a notification.
 
+        :param args: List[Tuple[str, bool]]
         :param message: str
         """
-        if args is None:
-            args = self._fallback_args
-        args = map(lambda x: x.replace('{message}', message), args)
-        # Convert to a list so we can easily assert invocations.
-        subprocess.check_call(list(args))
+        args = [arg.replace('{message}', message) if has_placeholder else arg for arg, has_placeholder in args]
+        # Notifications are fire-and-forget, so do not wait for the command to finish, and keep its output from
+        # interleaving with our own. A background thread reaps the command once it exits.
+        process = subprocess.Popen(args, stdin=_DEVNULL, stdout=_DEVNULL, stderr=_DEVNULL, close_fds=True)
+        reaper = threading.Thread(target=_reap, args=(process, args))
+        reaper.daemon = True
+        reaper.start()
 
     def state(self, message):
         """Send a notification that may be ignored.
@@ -220,11 +252,13 @@ class FileNotifier(Notifier):
 class StdioNotifier(Notifier):
     """Send notifications to stdout and stderr."""
 
+    # Build the ANSI escape sequences for the colors of all notification types once.
+    _COLOR_PREFIXES = {color: '\033[0;%dm  \033[0;1;%dm ' % (color + 40, color + 30) for color in (1, 2, 6, 7)}
+
     def _print(self, message, color, file=None):
         if file is None:
             file = sys.stdout
-        print('\033[0;%dm  \033[0;1;%dm %s\033[0m' %
-              (color + 40, color + 30, message), file=file)
+        print('%s%s\033[0m' % (self._COLOR_PREFIXES[color], message), file=file)
 
     def state(self, message):
         """Send a notification that may be ignored.
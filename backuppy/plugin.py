@@ -15,10 +15,11 @@ def _new(available_plugin_types, configuration, plugin_type, plugin_configuratio
     :return: Any
     :raise: ValueError
     """
-    if plugin_type not in available_plugin_types:
+    plugin_factory = available_plugin_types.get(plugin_type)
+    if plugin_factory is None:
         raise ValueError('`Type must be one of the following: %s, but `%s` was given.' % (
             ', '.join(available_plugin_types.keys()), plugin_type))
-    return available_plugin_types[plugin_type](configuration, plugin_configuration_data)
+    return plugin_factory(configuration, plugin_configuration_data)
 
 
 def _new_path_location_from_configuration_data(cls, configuration, configuration_data):
@@ -29,9 +30,9 @@ def _new_path_location_from_configuration_data(cls, configuration, configuration
     :return: cls
     :raise: ValueError
     """
-    if 'path' not in configuration_data:
+    path_data = configuration_data.get('path')
+    if path_data is None:
         raise ValueError('`path` is required.')
-    path_data = configuration_data['path']
     if '/' != path_data[0]:
         path_data = '%s/%s' % (configuration.working_directory, path_data)
     path = path_data
@@ -64,15 +65,17 @@ def _new_ssh_target_from_configuration_data(configuration, configuration_data):
 
     required_string_names = ('user', 'host', 'path')
     for required_string_name in required_string_names:
-        if required_string_name not in configuration_data:
+        required_string = configuration_data.get(required_string_name)
+        if required_string is None:
             raise ValueError('`%s` is required.' % required_string_name)
-        kwargs[required_string_name] = configuration_data[required_string_name]
+        kwargs[required_string_name] = required_string
 
-    if 'port' in configuration_data:
-        if configuration_data['port'] < 0 or configuration_data['port'] > 65535:
+    port = configuration_data.get('port')
+    if port is not None:
+        if port < 0 or port > 65535:
             raise ValueError(
                 '`port` must be an integer ranging from 0 to 65535.')
-        kwargs['port'] = configuration_data['port']
+        kwargs['port'] = port
 
     return SshTarget(configuration.notifier, interactive=configuration.interactive, **kwargs)
 
@@ -85,13 +88,10 @@ def _new_first_available_target_from_configuration_data(configuration, configura
     :return: cls
     :raise: ValueError
     """
-    targets = []
-    for target_configuration_data in configuration_data['targets']:
-        target_configuration_data.setdefault('configuration')
-        targets.append(
-            new_target(configuration, target_configuration_data['type'], target_configuration_data['configuration']))
+    targets = [new_target(configuration, target_configuration_data['type'], target_configuration_data.get('configuration'))
+               for target_configuration_data in configuration_data['targets']]
 
-    return FirstAvailableTarget(targets)
+    return FirstAvailableTarget(configuration.notifier, targets)
 
 
 def _discover_target_types():
@@ -117,11 +117,11 @@ def _new_command_notifier_from_configuration_data(configuration, configuration_d
     :return: CommandNotifier
     :raise: ValueError
     """
-    state_args = configuration_data['state'] if 'state' in configuration_data else None
-    inform_args = configuration_data['inform'] if 'inform' in configuration_data else None
-    confirm_args = configuration_data['confirm'] if 'confirm' in configuration_data else None
-    alert_args = configuration_data['alert'] if 'alert' in configuration_data else None
-    fallback_args = configuration_data['fallback'] if 'fallback' in configuration_data else None
+    state_args = configuration_data.get('state')
+    inform_args = configuration_data.get('inform')
+    confirm_args = configuration_data.get('confirm')
+    alert_args = configuration_data.get('alert')
+    fallback_args = configuration_data.get('fallback')
     if None in [state_args, inform_args, confirm_args, alert_args] and fallback_args is None:
         raise ValueError(
             '`fallback` must be given if one or more of the other arguments are omitted.')
@@ -129,6 +129,15 @@ def _new_command_notifier_from_configuration_data(configuration, configuration_d
     return CommandNotifier(state_args, inform_args, confirm_args, alert_args, fallback_args)
 
 
+def _open_notifier_file(path):
+    """Open a notification file for appending.
+
+    :param path: Optional[str]
+    :return: Optional[File]
+    """
+    return None if path is None else open(path, mode='a+t')
+
+
 def _new_file_notifier_from_configuration_data(configuration, configuration_data):
     """Parse configuration from raw, built-in types such as dictionaries, lists, and scalars.
 
@@ -137,16 +146,11 @@ def _new_file_notifier_from_configuration_data(configuration, configuration_data
     :return: CommandNotifier
     :raise: ValueError
     """
-    state_file = open(
-        configuration_data['state'], mode='a+t') if 'state' in configuration_data else None
-    inform_file = open(
-        configuration_data['inform'], mode='a+t') if 'inform' in configuration_data else None
-    confirm_file = open(
-        configuration_data['confirm'], mode='a+t') if 'confirm' in configuration_data else None
-    alert_file = open(
-        configuration_data['alert'], mode='a+t') if 'alert' in configuration_data else None
-    fallback_file = open(
-        configuration_data['fallback'], mode='a+t') if 'fallback' in configuration_data else None
+    state_file = _open_notifier_file(configuration_data.get('state'))
+    inform_file = _open_notifier_file(configuration_data.get('inform'))
+    confirm_file = _open_notifier_file(configuration_data.get('confirm'))
+    alert_file = _open_notifier_file(configuration_data.get('alert'))
+    fallback_file = _open_notifier_file(configuration_data.get('fallback'))
     if None in [state_file, inform_file, confirm_file, alert_file] and fallback_file is None:
         raise ValueError(
             '`fallback` must be given if one or more of the other arguments are omitted.')
@@ -154,15 +158,35 @@ def _new_file_notifier_from_configuration_data(configuration, configuration_data
     return FileNotifier(state_file, inform_file, confirm_file, alert_file, fallback_file)
 
 
+def _new_notify_send_notifier_from_configuration_data(configuration, configuration_data):
+    """Parse configuration from raw, built-in types such as dictionaries, lists, and scalars.
+
+    :param configuration: Configuration
+    :param configuration_data: dict
+    :return: NotifySendNotifier
+    """
+    return NotifySendNotifier()
+
+
+def _new_stdio_notifier_from_configuration_data(configuration, configuration_data):
+    """Parse configuration from raw, built-in types such as dictionaries, lists, and scalars.
+
+    :param configuration: Configuration
+    :param configuration_data: dict
+    :return: StdioNotifier
+    """
+    return StdioNotifier()
+
+
 def _discover_notifier_types():
     """Discover the available notifier types.
 
     :return: Dict
     """
     return {
-        'notify-send': lambda configuration, configuration_data: NotifySendNotifier(),
+        'notify-send': _new_notify_send_notifier_from_configuration_data,
         'command': _new_command_notifier_from_configuration_data,
-        'stdio': lambda configuration, configuration_data: StdioNotifier(),
+        'stdio': _new_stdio_notifier_from_configuration_data,
         'file': _new_file_notifier_from_configuration_data,
     }
 
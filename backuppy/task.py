@@ -1,29 +1,41 @@
 """Code to run back-ups."""
 import subprocess
+from functools import partial
 
 from backuppy.config import Configuration
 from backuppy.location import new_snapshot_name
 
 
-def rsync(configuration, origin, destination, path=None):
-    """Invoke rsync.
+_RSYNC_ARGS = ('rsync', '-ar', '--numeric-ids', '--relative')
 
-    :raise: subprocess.CalledProcessError
+
+def _rsync_args(configuration):
+    """Build the rsync arguments shared by all rsync invocations.
+
+    :param configuration: Configuration
+    :return: List[str]
     """
-    args = ['rsync', '-ar', '--numeric-ids', '--relative']
+    args = list(_RSYNC_ARGS)
 
     ssh_options = configuration.ssh_options()
     if ssh_options:
-        ssh_args = []
-        for option, value in ssh_options.items():
-            ssh_args.append('-o %s=%s' % (option, value))
         args.append('-e')
-        args.append('ssh %s' % ' '.join(ssh_args))
+        args.append('ssh %s' % ' '.join(['-o %s=%s' % option for option in ssh_options.items()]))
 
     if configuration.verbose:
         args.append('--verbose')
         args.append('--progress')
 
+    return args
+
+
+def rsync(configuration, origin, destination, path=None):
+    """Invoke rsync.
+
+    :raise: subprocess.CalledProcessError
+    """
+    args = _rsync_args(configuration)
+
     if path is None:
         path = ''
     args.append('%s./%s' % (origin.to_rsync(), path))
@@ -32,6 +44,37 @@ def rsync(configuration, origin, destination, path=None):
     subprocess.check_call(args)
 
 
+def rsync_many(configuration, origin, destination, paths):
+    """Invoke rsync once for several paths.
+
+    :param configuration: Configuration
+    :param origin: Location
+    :param destination: Location
+    :param paths: Iterable[str] The paths, relative to the origin.
+    :raise: subprocess.CalledProcessError
+    """
+    args = _rsync_args(configuration)
+    # Separate paths with NUL characters, so paths containing newlines are not split into several entries.
+    args.append('--from0')
+    args.append('--files-from=-')
+    args.append(origin.to_rsync())
+    args.append(destination.to_rsync())
+
+    process = subprocess.Popen(args, stdin=subprocess.PIPE)
+    process.communicate('\0'.join(paths).encode('utf-8'))
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args)
+
+
+def _close(configuration):
+    """Close the configuration's locations, so any connections are not kept open until the process exits.
+
+    :param configuration: Configuration
+    """
+    configuration.source.close()
+    configuration.target.close()
+
+
 def backup(configuration, path=None):
     """Start a new back-up.
 
@@ -39,11 +82,37 @@ def backup(configuration, path=None):
     :param path: str
     """
     assert isinstance(configuration, Configuration)
+    try:
+        return _backup(configuration, partial(rsync, path=path))
+    finally:
+        _close(configuration)
+
+
+def backup_many(configuration, paths):
+    """Start a new back-up of several paths, using a single rsync invocation.
+
+    :param configuration: Configuration
+    :param paths: Iterable[str]
+    """
+    assert isinstance(configuration, Configuration)
+    try:
+        return _backup(configuration, partial(rsync_many, paths=paths))
+    finally:
+        _close(configuration)
+
+
+def _backup(configuration, transfer):
+    """Start a new back-up.
+
+    :param configuration: Configuration
+    :param transfer: Callable[[Configuration, Location, Location], None]
+    """
+    name = configuration.name
     notifier = configuration.notifier
     source = configuration.source
     target = configuration.target
 
-    notifier.state('Initializing back-up %s' % configuration.name)
+    notifier.state('Initializing back-up %s' % name)
 
     if not source.is_available():
         notifier.alert('No back-up source available.')
@@ -53,18 +122,18 @@ def backup(configuration, path=None):
         notifier.alert('No back-up target available.')
         return False
 
-    notifier.inform('Backing up %s...' % configuration.name)
+    notifier.inform('Backing up %s...' % name)
 
     snapshot_name = new_snapshot_name()
     target.snapshot(snapshot_name)
 
     try:
-        rsync(configuration, source, target, path)
-        notifier.confirm('Back-up %s complete.' % configuration.name)
+        transfer(configuration, source, target)
+        notifier.confirm('Back-up %s complete.' % name)
         return True
     except subprocess.CalledProcessError:
         configuration.logger.exception('An rsync error occurred.')
-        notifier.confirm('Back-up %s failed.' % configuration.name)
+        notifier.confirm('Back-up %s failed.' % name)
         return False
 
 
@@ -75,12 +144,24 @@ def restore(configuration, path=None):
     :param path: str
     """
     assert isinstance(configuration, Configuration)
+    try:
+        return _restore(configuration, path)
+    finally:
+        _close(configuration)
+
+
+def _restore(configuration, path=None):
+    """Restores a back-up.
+
+    :param configuration: Configuration
+    :param path: str
+    """
+    name = configuration.name
     notifier = configuration.notifier
     source = configuration.source
     target = configuration.target
 
-    notifier.state('Initializing restoration of back-up %s' %
-                   configuration.name)
+    notifier.state('Initializing restoration of back-up %s' % name)
 
     if not source.is_available():
         notifier.alert('No back-up source available.')
@@ -90,13 +171,13 @@ def restore(configuration, path=None):
         notifier.alert('No back-up target available.')
         return False
 
-    notifier.inform('Restoring %s...' % configuration.name)
+    notifier.inform('Restoring %s...' % name)
 
     try:
         rsync(configuration, target, source, path)
-        notifier.confirm('Restoration of back-up %s complete.' % configuration.name)
+        notifier.confirm('Restoration of back-up %s complete.' % name)
         return True
     except subprocess.CalledProcessError:
         configuration.logger.exception('An rsync error occurred.')
-        notifier.alert('Restoration of back-up %s failed.' % configuration.name)
+        notifier.alert('Restoration of back-up %s failed.' % name)
         return False
@@ -1,13 +1,16 @@
+import filecmp
 import os
 import subprocess
 from tempfile import NamedTemporaryFile
 
 from backuppy.location import SshTarget, SshSource
 
-RESOURCE_PATH = '/'.join(
-    (os.path.dirname(os.path.abspath(__file__)), 'resources'))
+RESOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
 
-CONFIGURATION_PATH = '/'.join((RESOURCE_PATH, 'configuration'))
+CONFIGURATION_PATH = os.path.join(RESOURCE_PATH, 'configuration')
+BACKUPPY_JSON = os.path.join(CONFIGURATION_PATH, 'backuppy.json')
+BACKUPPY_YML = os.path.join(CONFIGURATION_PATH, 'backuppy.yml')
+BACKUPPY_MIN_JSON = os.path.join(CONFIGURATION_PATH, 'backuppy-minimal.json')
 
 
 def build_files_stage_1(path):
@@ -60,35 +63,21 @@ def assert_path_appears(test, source_path, target_path):
     :param target_path: str
     :raise: AssertionError
     """
-    source_path = source_path.rstrip('/') + '/'
-    target_path = target_path.rstrip('/') + '/'
-    try:
-        for target_dir_path, child_dir_names, child_file_names in os.walk(target_path):
-            source_dir_path = os.path.join(
-                source_path, target_dir_path[len(target_path):])
-            for child_file_name in child_file_names:
-                with open(os.path.join(target_dir_path, child_file_name)) as target_f:
-                    with open(os.path.join(source_dir_path, child_file_name)) as source_f:
-                        assert_file(test, source_f, target_f)
-    except Exception:
-        raise AssertionError(
-            'The source contents under the path `%s` are not equal to the target contents under `%s`.' % (
+    if not source_path.endswith('/'):
+        source_path += '/'
+    if not target_path.endswith('/'):
+        target_path += '/'
+    for target_dir_path, child_dir_names, child_file_names in os.walk(target_path):
+        source_dir_path = os.path.join(
+            source_path, target_dir_path[len(target_path):])
+        # filecmp compares sizes before contents, and reports missing files as errors.
+        _, mismatches, errors = filecmp.cmpfiles(
+            source_dir_path, target_dir_path, child_file_names, shallow=False)
+        if mismatches or errors:
+            test.fail('The source contents under the path `%s` are not equal to the target contents under `%s`.' % (
                 source_path, target_path))
 
 
-def assert_file(test, source_f, target_f):
-    """Assert two source and target files are identical.
-
-    :param test: unittest.TestCase
-    :param source_f: File
-    :param target_f: File
-    :raise: AssertionError
-    """
-    source_f.seek(0)
-    target_f.seek(0)
-    test.assertEquals(source_f.read(), target_f.read())
-
-
 class SshLocationContainer(object):
     """Run a Docker container to serve as an SSH location."""
 
@@ -102,6 +91,7 @@ class SshLocationContainer(object):
     def __init__(self, mount_point=None):
         """Initialize a new instance."""
         self._started = False
+        self._id = None
         self._ip = None
         self._fingerprint = None
         self._known_hosts = None
@@ -119,8 +109,9 @@ class SshLocationContainer(object):
             docker_args += ['-v', '%s:%s' %
                             (self._mount_point, self.PATH)]
         self.stop()
-        subprocess.check_call(['docker', 'run', '-d', '--name',
-                               self.NAME] + docker_args + ['backuppy_ssh_location'])
+        # `docker run -d` prints the container ID, so we can refer to the container without looking it up again.
+        self._id = subprocess.check_output(['docker', 'run', '-d', '--name',
+                                            self.NAME] + docker_args + ['backuppy_ssh_location']).strip().decode('utf-8')
         self._started = True
         self.await()
         subprocess.check_call(['sshpass', '-p', self.PASSWORD, 'scp', '-o', 'UserKnownHostsFile=%s' % self.known_hosts(
@@ -131,8 +122,8 @@ class SshLocationContainer(object):
         if not self._started:
             return
         self._started = False
-        subprocess.check_call(['docker', 'stop', self.NAME])
-        subprocess.check_call(['docker', 'container', 'rm', self.NAME])
+        # Kill and remove the container at once, rather than wait for it to stop gracefully first.
+        subprocess.check_call(['docker', 'container', 'rm', '--force', self._id])
         self._known_hosts.close()
 
     @property
@@ -146,7 +137,7 @@ class SshLocationContainer(object):
         if not self._ip:
             self._ip = str(subprocess.check_output(
                 ['docker', 'inspect', '-f', '{{range .NetworkSettings.Networks}}{{.IPAddress}}{{end}}',
-                 self.NAME]).strip().decode('utf-8'))
+                 self._id]).strip().decode('utf-8'))
 
         return self._ip
 
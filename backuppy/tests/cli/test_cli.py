@@ -1,6 +1,5 @@
 import json
 import os
-import subprocess
 from logging import Logger, NOTSET
 from tempfile import NamedTemporaryFile
 from unittest import TestCase
@@ -17,32 +16,104 @@ try:
 except ImportError:
     from backports.tempfile import TemporaryDirectory
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 from backuppy.cli.cli import main, FORMAT_JSON_EXTENSIONS, FORMAT_YAML_EXTENSIONS
 from backuppy.config import from_json, from_yaml
 from backuppy.location import PathSource, PathTarget
-from backuppy.tests import CONFIGURATION_PATH
+from backuppy.tests import BACKUPPY_JSON
+
+
+def _capture_cli(args):
+    """Invoke the CLI in-process, as the `backuppy` command would, and capture its output.
+
+    :param args: List[str]
+    :return: str
+    """
+    with patch('sys.stdout', new_callable=StringIO) as stdout, patch('sys.argv', ['backuppy']), \
+            patch.dict(os.environ, {'COLUMNS': '80'}):
+        try:
+            main(args)
+        except SystemExit:
+            pass
+    return stdout.getvalue()
+
+
+_CLI_HELP = None
+_README = None
+
+
+def _cli_help():
+    """Get the CLI command's help output, which is the same for every test.
+
+    :return: str
+    """
+    global _CLI_HELP
+    if _CLI_HELP is None:
+        _CLI_HELP = _capture_cli(['--help'])
+    return _CLI_HELP
+
+
+def _readme():
+    """Get the contents of README.md.
+
+    :return: str
+    """
+    global _README
+    if _README is None:
+        readme_path = os.path.join(os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 'README.md')
+        with open(readme_path) as f:
+            _README = f.read()
+    return _README
 
 
 class CliTest(TestCase):
     def test_help_appears_in_readme(self):
         """Assert that the CLI command's help output in README.md is up-to-date."""
-        cli_help = subprocess.check_output(
-            ['backuppy', '--help']).decode('utf-8')
-        readme_path = os.path.join(os.path.dirname(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'README.md')
-        with open(readme_path) as f:
-            self.assertIn(cli_help, f.read())
+        self.assertIn(_cli_help(), _readme())
 
     def test_call_without_subcommand_or_arguments_prints_help(self):
         """Assert that the CLI command prints its help if it does not know what to do."""
-        output_with_help = subprocess.check_output(
-            ['backuppy', '--help']).decode('utf-8')
-        output_without_arguments = subprocess.check_output(
-            ['backuppy']).decode('utf-8')
-        self.assertEquals(output_without_arguments, output_with_help)
+        output_without_arguments = _capture_cli([])
+        self.assertEquals(output_without_arguments, _cli_help())
+
+
+class CliBackupTest(TestCase):
+    @patch('sys.stdout')
+    @patch('sys.stderr')
+    @patch('argparse.ArgumentParser')
+    @patch('backuppy.task.backup')
+    def test_backup_without_argument_parser(self, m_backup, m_argument_parser, m_stderr, m_stdout):
+        args = ['backup', '-c', BACKUPPY_JSON]
+        main(args)
+        m_argument_parser.assert_not_called()
+        configuration = m_backup.call_args[0][0]
+        self.assertEquals(configuration.name, 'Test')
 
 
 class CliRestoreTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(BACKUPPY_JSON) as f:
+            configuration = json.load(f)
+        configuration['notifications'] = [
+            {
+                'type': 'stdio',
+            }
+        ]
+        # This file is shared by all tests in this class, and deleted when it is closed.
+        cls.stdio_configuration_file = NamedTemporaryFile(mode='w+t', suffix='.json')
+        json.dump(configuration, cls.stdio_configuration_file)
+        cls.stdio_configuration_file.flush()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stdio_configuration_file.close()
+
     @patch('sys.stdout')
     @patch('sys.stderr')
     def test_restore_without_arguments(self, m_stdout, m_stderr):
@@ -55,8 +126,7 @@ class CliRestoreTest(TestCase):
     @patch('backuppy.task.restore')
     def test_keyboard_interrupt_in_command_should_exit_gracefully(self, m_restore, m_stderr, m_stdout):
         m_restore.side_effect = KeyboardInterrupt
-        configuration_file_path = '%s/backuppy.json' % CONFIGURATION_PATH
-        args = ['restore', '--non-interactive', '-c', configuration_file_path]
+        args = ['restore', '--non-interactive', '-c', BACKUPPY_JSON]
         main(args)
         m_stdout.write.assert_has_calls([call('Quitting...')])
         m_stderr.write.assert_not_called()
@@ -76,34 +146,26 @@ class CliRestoreTest(TestCase):
         m_restore.side_effect = error_type
         m_logger = Mock(Logger)
         m_logger.handlers = Mock(side_effect=lambda: [])
+        m_logger.disabled = False
+        m_logger.level = NOTSET
         m_logger.getEffectiveLevel.side_effect = Mock(
             side_effect=lambda: NOTSET)
         m_get_logger.return_value = m_logger
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
-        configuration['notifications'] = [
-            {
-                'type': 'stdio',
-            }
-        ]
-        with NamedTemporaryFile(mode='w+t', suffix='.json') as f:
-            json.dump(configuration, f)
-            f.seek(0)
-            args = ['restore', '--non-interactive', '-c', f.name]
-            main(args)
-            m_get_logger.assert_called_with('backuppy')
-            self.assertTrue(m_logger.exception.called)
-            m_stderr.write.assert_has_calls([
-                call(
-                    '\x1b[0;41m  \x1b[0;1;31m A fatal error occurred. Details have been logged as per your configuration.\x1b[0m'),
-            ])
+        args = ['restore', '--non-interactive', '-c', self.stdio_configuration_file.name]
+        main(args)
+        m_get_logger.assert_called_with('backuppy')
+        self.assertTrue(m_logger.exception.called)
+        m_stderr.write.assert_has_calls([
+            call(
+                '\x1b[0;41m  \x1b[0;1;31m A fatal error occurred. Details have been logged as per your configuration.\x1b[0m'),
+        ])
 
 
 class CliInitTest(TestCase):
     @parameterized.expand([
         (True, 'yaml'),
-        (True, 'yaml'),
-        (False, 'json'),
+        (False, 'yaml'),
+        (True, 'json'),
         (False, 'json'),
     ])
     @patch('backuppy.cli.input._input')
@@ -119,14 +181,16 @@ class CliInitTest(TestCase):
             file_path_extensions = FORMAT_YAML_EXTENSIONS if 'yaml' == format else FORMAT_JSON_EXTENSIONS
             file_path_extensions_label = ', '.join(
                 map(lambda x: '*.' + x, file_path_extensions))
-            m_input.side_effect = lambda *args: {
-                ('Name: ',): name,
-                ('Verbose output [Y/n]: ',): 'y' if verbose else 'n',
-                ('File format (0-1): ',): '0' if 'yaml' == format else '1',
-                ('Destination (%s): ' % file_path_extensions_label,): configuration_file_path,
-                ('Source path: ',): source_path,
-                ('Target path: ',): target_path,
-            }[args]
+            # Questions precede the prompts on separate lines, so answer based on the prompts' last lines.
+            responses = {
+                'Name: ': name,
+                'Verbose output [Y/n]: ': 'y' if verbose else 'n',
+                'File format (0-1): ': '0' if 'yaml' == format else '1',
+                'Destination (%s): ' % file_path_extensions_label: configuration_file_path,
+                'Source path: ': source_path,
+                'Target path: ': target_path,
+            }
+            m_input.side_effect = lambda prompt: responses[prompt.split('\n')[-1]]
             args = ['init']
             main(args)
             with open(configuration_file_path) as f:
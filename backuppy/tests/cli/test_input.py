@@ -20,9 +20,10 @@ class AskConfirmTest(TestCase):
     ])
     @patch('backuppy.cli.input._input')
     def test_ask_confirm(self, expected, prompt, raw_input, value_label, question, default, m_input):
-        m_input.side_effect = lambda *args: {
+        responses = {
             (prompt,): raw_input,
-        }[args]
+        }
+        m_input.side_effect = lambda *args: responses[args]
         actual = ask_confirm(value_label, question=question, default=default)
         self.assertEquals(actual, expected)
 
@@ -41,9 +42,10 @@ class AskOptionTest(TestCase):
     ])
     @patch('backuppy.cli.input._input')
     def test_ask_option(self, expected, cli_input, value_label, question, options, m_input):
-        m_input.side_effect = lambda *args: {
+        responses = {
             ('Foo (0-2): ',): cli_input,
-        }[args]
+        }
+        m_input.side_effect = lambda *args: responses[args]
         actual = ask_option(value_label, options, question=question)
         self.assertEquals(actual, expected)
 
@@ -58,25 +60,37 @@ class AskOptionTest(TestCase):
 class AskAnyTest(TestCase):
     @patch('backuppy.cli.input._input')
     def test_ask_any_optional(self, m_input):
-        m_input.side_effect = lambda *args: {
+        responses = {
             ('Foo: ',): '',
-        }[args]
+        }
+        m_input.side_effect = lambda *args: responses[args]
         actual = ask_any('Foo', required=False)
         self.assertEquals(actual, '')
 
     @patch('backuppy.cli.input._input')
     def test_ask_any_required(self, m_input):
-        m_input.side_effect = lambda *args: {
+        responses = {
             ('Foo: ',): 'Bar',
-        }[args]
+        }
+        m_input.side_effect = lambda *args: responses[args]
         actual = ask_any('Foo', required=True)
         self.assertEquals(actual, 'Bar')
 
+    @patch('backuppy.cli.input._input')
+    def test_ask_any_with_question(self, m_input):
+        responses = {
+            ('What is foo?\nFoo: ',): 'Bar',
+        }
+        m_input.side_effect = lambda *args: responses[args]
+        actual = ask_any('Foo', question='What is foo?')
+        self.assertEquals(actual, 'Bar')
+
     @patch('backuppy.cli.input._input')
     def test_ask_any_with_validator(self, m_input):
-        m_input.side_effect = lambda *args: {
+        responses = {
             ('Foo: ',): 'Bar',
-        }[args]
+        }
+        m_input.side_effect = lambda *args: responses[args]
 
         def _validator(value):
             return value + 'Baz'
@@ -1,11 +1,11 @@
 import json
+from copy import deepcopy
 from logging import Logger
-from tempfile import NamedTemporaryFile
 from unittest import TestCase
 
 from backuppy.location import Source, Target
 from backuppy.notifier import Notifier
-from backuppy.tests import CONFIGURATION_PATH
+from backuppy.tests import BACKUPPY_JSON, BACKUPPY_MIN_JSON, BACKUPPY_YML, CONFIGURATION_PATH
 
 try:
     from unittest.mock import Mock, patch
@@ -14,8 +14,18 @@ except ImportError:
 
 from backuppy.config import Configuration, from_json, from_yaml, from_configuration_data
 
+# The parsed backuppy.json fixture. Tests that modify it must do so on a deep copy.
+with open(BACKUPPY_JSON) as f:
+    _CONFIGURATION_DATA = json.load(f)
+
 
 class ConfigurationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.notifier = Mock(Notifier)
+        cls.source = Mock(Source)
+        cls.target = Mock(Target)
+
     def test_verbose(self):
         sut = Configuration('Foo', verbose=True)
         self.assertTrue(sut.verbose)
@@ -40,31 +50,28 @@ class ConfigurationTest(TestCase):
         sut = Configuration('Foo')
         with self.assertRaises(AttributeError):
             sut.notifier
-        notifier = Mock(Notifier)
-        sut.notifier = notifier
-        self.assertEquals(sut.notifier, notifier)
+        sut.notifier = self.notifier
+        self.assertEquals(sut.notifier, self.notifier)
         with self.assertRaises(AttributeError):
-            sut.notifier = notifier
+            sut.notifier = self.notifier
 
     def test_source(self):
         sut = Configuration('Foo')
         with self.assertRaises(AttributeError):
             sut.source
-        source = Mock(Source)
-        sut.source = source
-        self.assertEquals(sut.source, source)
+        sut.source = self.source
+        self.assertEquals(sut.source, self.source)
         with self.assertRaises(AttributeError):
-            sut.source = source
+            sut.source = self.source
 
     def test_target(self):
         sut = Configuration('Foo')
         with self.assertRaises(AttributeError):
             sut.target
-        target = Mock(Target)
-        sut.target = target
-        self.assertEquals(sut.target, target)
+        sut.target = self.target
+        self.assertEquals(sut.target, self.target)
         with self.assertRaises(AttributeError):
-            sut.target = target
+            sut.target = self.target
 
     def test_logger(self):
         sut = Configuration('Foo')
@@ -74,98 +81,76 @@ class ConfigurationTest(TestCase):
 
 class FromConfigurationData(TestCase):
     def test_minimal(self):
-        with open('%s/backuppy-minimal.json' % CONFIGURATION_PATH) as f:
+        with open(BACKUPPY_MIN_JSON) as f:
             configuration = from_configuration_data(f.name, json.load(f))
             self.assertIsInstance(configuration, Configuration)
 
     def test_verbose_non_boolean(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
+        configuration = deepcopy(_CONFIGURATION_DATA)
         configuration['verbose'] = 666
-        with NamedTemporaryFile(mode='w+t') as f:
-            json.dump(configuration, f)
-            with self.assertRaises(ValueError):
-                from_configuration_data(f.name, configuration)
+        with self.assertRaises(ValueError):
+            from_configuration_data(BACKUPPY_JSON, configuration)
 
     def test_interactive_non_boolean(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
+        configuration = deepcopy(_CONFIGURATION_DATA)
         configuration['interactive'] = 666
-        with NamedTemporaryFile(mode='w+t') as f:
-            json.dump(configuration, f)
-            with self.assertRaises(ValueError):
-                from_configuration_data(f.name, configuration)
+        with self.assertRaises(ValueError):
+            from_configuration_data(BACKUPPY_JSON, configuration)
 
     def test_notifier_type_missing(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
+        configuration = deepcopy(_CONFIGURATION_DATA)
         del configuration['notifications'][0]['type']
-        with NamedTemporaryFile(mode='w+t') as f:
-            json.dump(configuration, f)
-            with self.assertRaises(ValueError):
-                from_configuration_data(f.name, configuration)
+        with self.assertRaises(ValueError):
+            from_configuration_data(BACKUPPY_JSON, configuration)
 
     def test_source_missing(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
+        configuration = deepcopy(_CONFIGURATION_DATA)
         del configuration['source']
-        with NamedTemporaryFile(mode='w+t') as f:
-            json.dump(configuration, f)
-            with self.assertRaises(ValueError):
-                from_configuration_data(f.name, configuration)
+        with self.assertRaises(ValueError):
+            from_configuration_data(BACKUPPY_JSON, configuration)
 
     def test_source_type_missing(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
+        configuration = deepcopy(_CONFIGURATION_DATA)
         del configuration['source']['type']
-        with NamedTemporaryFile(mode='w+t') as f:
-            json.dump(configuration, f)
-            with self.assertRaises(ValueError):
-                from_configuration_data(f.name, configuration)
+        with self.assertRaises(ValueError):
+            from_configuration_data(BACKUPPY_JSON, configuration)
 
     def test_target_missing(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
+        configuration = deepcopy(_CONFIGURATION_DATA)
         del configuration['target']
-        with NamedTemporaryFile(mode='w+t') as f:
-            json.dump(configuration, f)
-            with self.assertRaises(ValueError):
-                from_configuration_data(f.name, configuration)
+        with self.assertRaises(ValueError):
+            from_configuration_data(BACKUPPY_JSON, configuration)
 
     def test__target_type_missing(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration = json.load(f)
+        configuration = deepcopy(_CONFIGURATION_DATA)
         del configuration['target']['type']
-        with NamedTemporaryFile(mode='w+t') as f:
-            json.dump(configuration, f)
-            with self.assertRaises(ValueError):
-                from_configuration_data(f.name, configuration)
+        with self.assertRaises(ValueError):
+            from_configuration_data(BACKUPPY_JSON, configuration)
 
     @patch('logging.config.dictConfig')
     def test_logging(self, m):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
-            configuration_data = json.load(f)
-            configuration_data['logging'] = {
-                'version': 1,
-                'handlers': {
-                    __name__: {
-                        'class': 'logging.FileHandler',
-                        'filename': '/tmp/foo',
-                    },
+        configuration_data = deepcopy(_CONFIGURATION_DATA)
+        configuration_data['logging'] = {
+            'version': 1,
+            'handlers': {
+                __name__: {
+                    'class': 'logging.FileHandler',
+                    'filename': '/tmp/foo',
                 },
-                'loggers': {
-                    'backuppy': {
-                        'handlers': [__name__],
-                    },
+            },
+            'loggers': {
+                'backuppy': {
+                    'handlers': [__name__],
                 },
-            }
-        from_configuration_data(f.name, configuration_data)
+            },
+        }
+        from_configuration_data(BACKUPPY_JSON, configuration_data)
         m.assert_called_with(configuration_data['logging'])
 
 
 class FromJsonTest(TestCase):
     def test_from_json(self):
-        with open('%s/backuppy.json' % CONFIGURATION_PATH) as f:
+        with open(BACKUPPY_JSON) as f:
             configuration = from_json(f)
         self.assertTrue(configuration.verbose)
         self.assertFalse(configuration.interactive)
@@ -173,7 +158,7 @@ class FromJsonTest(TestCase):
 
 class FromYamlTest(TestCase):
     def test_from_Yaml(self):
-        with open('%s/backuppy.yml' % CONFIGURATION_PATH) as f:
+        with open(BACKUPPY_YML) as f:
             configuration = from_yaml(f)
         self.assertTrue(configuration.verbose)
         self.assertFalse(configuration.interactive)
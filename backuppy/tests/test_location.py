@@ -1,11 +1,18 @@
 import os
 import socket
 import subprocess
+import threading
+import time
 from logging import getLogger
+from time import struct_time
 from unittest import TestCase
+from parameterized import parameterized
 from paramiko import SSHException, SSHClient, PKey
+from paramiko.ssh_exception import NoValidConnectionsError
 
-from backuppy.location import PathLocation, SshTarget, FirstAvailableTarget, _new_snapshot_args, PathTarget, AskPolicy
+from backuppy.location import PathLocation, SshTarget, FirstAvailableTarget, _new_snapshot_args, PathTarget, \
+    AskPolicy, _new_snapshot_command, _new_snapshot_script, close_ssh_clients, \
+    new_snapshot_name
 from backuppy.notifier import Notifier
 from backuppy.tests import SshLocationContainer
 
@@ -20,6 +27,13 @@ except ImportError:
     from backports.tempfile import TemporaryDirectory
 
 
+class NewSnapshotNameTest(TestCase):
+    @patch('backuppy.location.gmtime')
+    def test_new_snapshot_name(self, m):
+        m.return_value = struct_time((2018, 1, 2, 3, 4, 5, 1, 2, 0))
+        self.assertEquals('2018-01-02_03-04-05_UTC', new_snapshot_name())
+
+
 class NewSnapshotArgsTest(TestCase):
     def test_new_snapshot_args(self):
         snapshot_name = 'foo_bar'
@@ -30,6 +44,26 @@ class NewSnapshotArgsTest(TestCase):
             self.assertTrue(os.path.exists('/'.join([path, 'latest'])))
 
 
+class NewSnapshotCommandTest(TestCase):
+    def test_new_snapshot_command(self):
+        snapshot_name = 'foo_bar'
+        with TemporaryDirectory() as path:
+            subprocess.check_call(
+                ['sh', '-c', _new_snapshot_command(snapshot_name)], cwd=path)
+            self.assertTrue(os.path.exists('/'.join([path, snapshot_name])))
+            self.assertTrue(os.path.exists('/'.join([path, 'latest'])))
+
+
+class NewSnapshotScriptTest(TestCase):
+    def test_new_snapshot_script(self):
+        snapshot_name = 'foo_bar'
+        with TemporaryDirectory() as path:
+            subprocess.check_call(
+                ['bash', '-c', _new_snapshot_script(snapshot_name)], cwd=path)
+            self.assertTrue(os.path.exists('/'.join([path, snapshot_name])))
+            self.assertTrue(os.path.exists('/'.join([path, 'latest'])))
+
+
 class PathLocationTest(TestCase):
     class PathLocation(PathLocation):
         def snapshot(self, name):
@@ -52,6 +86,14 @@ class PathLocationTest(TestCase):
         sut = self.PathLocation(logger, notifier, path)
         self.assertFalse(sut.is_available())
 
+    def test_is_available_should_check_the_path_every_time(self):
+        logger = getLogger(__name__)
+        notifier = Mock(Notifier)
+        with TemporaryDirectory() as path:
+            sut = self.PathLocation(logger, notifier, path)
+            self.assertTrue(sut.is_available())
+        self.assertFalse(sut.is_available())
+
 
 class PathTargetTest(TestCase):
     def test_to_rsync(self):
@@ -86,6 +128,21 @@ class PathTargetTest(TestCase):
             self.assertEquals(latest_snapshot_path,
                               '/'.join([path, snapshot_2_name]))
 
+    def test_snapshot_many(self):
+        snapshot_1_name = 'foo-bar'
+        snapshot_2_name = 'BAZ_QUX'
+        logger = getLogger(__name__)
+        notifier = Mock(Notifier)
+        with TemporaryDirectory() as path:
+            sut = PathTarget(logger, notifier, path)
+            sut.snapshot_many([snapshot_1_name, snapshot_2_name])
+            latest_snapshot_path = subprocess.check_output(['readlink', '-f', '/'.join([path, 'latest'])]).decode(
+                'utf-8').strip()
+            self.assertTrue(os.path.exists('/'.join([path, snapshot_1_name])))
+            self.assertTrue(os.path.exists('/'.join([path, snapshot_2_name])))
+            self.assertEquals(latest_snapshot_path,
+                              '/'.join([path, snapshot_2_name]))
+
 
 class AskPolicyTest(TestCase):
     @patch('backuppy.cli.input._input')
@@ -111,6 +168,14 @@ class AskPolicyTest(TestCase):
 
 
 class SshTargetTest(TestCase):
+    def setUp(self):
+        create_connection_patcher = patch('socket.create_connection')
+        self._m_create_connection = create_connection_patcher.start()
+        self.addCleanup(create_connection_patcher.stop)
+
+    def tearDown(self):
+        close_ssh_clients()
+
     def test_to_rsync(self):
         notifier = Mock(Notifier)
         user = 'bart'
@@ -149,6 +214,13 @@ class SshTargetTest(TestCase):
         self.assertNotEquals([], m.return_value.connect.mock_calls)
         m.return_value.connect.assert_called_with(host, port, user, timeout=9)
 
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_is_available_should_keep_connection_alive(self, m):
+        notifier = Mock(Notifier)
+        sut = SshTarget(notifier, 'bart', 'example.com', '/var/cache', 666, keepalive_interval=15)
+        self.assertTrue(sut.is_available())
+        m.return_value.get_transport.return_value.set_keepalive.assert_called_once_with(15)
+
     @patch('paramiko.SSHClient', autospec=True)
     def test_is_available_connection_error(self, m):
         m.return_value.connect = Mock(side_effect=SSHException)
@@ -175,6 +247,54 @@ class SshTargetTest(TestCase):
         self.assertNotEquals([], m.return_value.connect.mock_calls)
         m.return_value.connect.assert_called_with(host, port, user, timeout=9)
 
+    @parameterized.expand([
+        (NoValidConnectionsError({('127.0.0.1', 666): socket.error('Connection refused')}),),
+        (socket.gaierror('Name or service not known'),),
+    ])
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_is_available_unreachable(self, error, m):
+        m.return_value.connect = Mock(side_effect=error)
+        notifier = Mock(Notifier)
+        user = 'bart'
+        host = 'example.com'
+        port = 666
+        path = '/var/cache'
+        sut = SshTarget(notifier, user, host, path, port)
+        self.assertFalse(sut.is_available())
+        m.return_value.connect.assert_called_with(host, port, user, timeout=9)
+        self.assertTrue(notifier.alert.called)
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_is_available_should_probe_before_connecting(self, m):
+        notifier = Mock(Notifier)
+        sut = SshTarget(notifier, 'bart', 'example.com', '/var/cache', 666)
+        self.assertTrue(sut.is_available())
+        self._m_create_connection.assert_called_once_with(('example.com', 666), 1)
+        self._m_create_connection.return_value.close.assert_called_once_with()
+
+    @parameterized.expand([
+        (socket.error('Connection refused'), 'The remote is unreachable: '),
+        (socket.gaierror('Name or service not known'), 'The remote is unreachable: '),
+        (socket.timeout(), 'The remote timed out.'),
+    ])
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_is_available_probe_failure(self, error, expected_alert, m):
+        self._m_create_connection.side_effect = error
+        notifier = Mock(Notifier)
+        sut = SshTarget(notifier, 'bart', 'example.com', '/var/cache', 666)
+        self.assertFalse(sut.is_available())
+        m.return_value.connect.assert_not_called()
+        self.assertTrue(notifier.alert.call_args[0][0].startswith(expected_alert))
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_is_available_should_not_hide_local_errors(self, m):
+        m.return_value.connect = Mock(side_effect=IOError('No such identity file'))
+        notifier = Mock(Notifier)
+        sut = SshTarget(notifier, 'bart', 'example.com', '/var/cache', 666, identity='/nonexistent')
+        with self.assertRaises(IOError):
+            sut.is_available()
+        notifier.alert.assert_not_called()
+
     @patch('paramiko.SSHClient', autospec=True)
     def test_snapshot_without_name(self, m):
         snapshot_name = 'foo_bar'
@@ -183,11 +303,88 @@ class SshTargetTest(TestCase):
         host = 'example.com'
         port = 666
         path = '/var/cache'
+        stdout = Mock()
+        stdout.channel.recv_exit_status.return_value = 0
+        m.return_value.exec_command.return_value = (Mock(), stdout, Mock())
         sut = SshTarget(notifier, user, host, path, port)
         sut.snapshot(snapshot_name)
         m.return_value.connect.assert_called_with(host, port, user, timeout=9)
-        for args in _new_snapshot_args(snapshot_name):
-            m.return_value.__enter__().exec_command.assert_any_call(' '.join(args))
+        m.return_value.exec_command.assert_called_once_with(
+            _new_snapshot_command(snapshot_name))
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_snapshot_many(self, m):
+        notifier = Mock(Notifier)
+        stdout = Mock()
+        stdout.channel.recv_exit_status.return_value = 0
+        m.return_value.exec_command.return_value = (Mock(), stdout, Mock())
+        sut = SshTarget(notifier, 'bart', 'example.com', '/var/cache', 666)
+        sut.snapshot_many(['foo_bar', 'baz_qux'])
+        self.assertEquals(1, m.return_value.exec_command.call_count)
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_snapshot_failure(self, m):
+        notifier = Mock(Notifier)
+        stdout = Mock()
+        stdout.read.return_value = b'Permission denied'
+        stdout.channel.recv_exit_status.return_value = 1
+        m.return_value.exec_command.return_value = (Mock(), stdout, Mock())
+        sut = SshTarget(notifier, 'bart', 'example.com', '/var/cache', 666)
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            sut.snapshot('foo_bar')
+        self.assertEquals(b'Permission denied', cm.exception.output)
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_snapshot_should_reuse_connection(self, m):
+        notifier = Mock(Notifier)
+        user = 'bart'
+        host = 'example.com'
+        port = 666
+        path = '/var/cache'
+        sut = SshTarget(notifier, user, host, path, port)
+        stdout = Mock()
+        stdout.channel.recv_exit_status.return_value = 0
+        m.return_value.exec_command.return_value = (Mock(), stdout, Mock())
+        self.assertTrue(sut.is_available())
+        sut.snapshot('foo_bar')
+        m.return_value.connect.assert_called_once_with(host, port, user, timeout=9)
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_concurrent_connections_should_share_a_client(self, m):
+        # Keep connecting slow, so all threads try to connect at the same time.
+        m.return_value.connect.side_effect = lambda *args, **kwargs: time.sleep(0.1)
+        notifier = Mock(Notifier)
+        suts = [SshTarget(notifier, 'bart', 'example.com', '/var/cache', 666) for _ in range(3)]
+        threads = [threading.Thread(target=sut.is_available) for sut in suts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        m.return_value.connect.assert_called_once_with('example.com', 666, 'bart', timeout=9)
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_close(self, m):
+        notifier = Mock(Notifier)
+        user = 'bart'
+        host = 'example.com'
+        port = 666
+        path = '/var/cache'
+        sut = SshTarget(notifier, user, host, path, port)
+        self.assertTrue(sut.is_available())
+        sut.close()
+        m.return_value.close.assert_called_once_with()
+
+    @patch('paramiko.SSHClient', autospec=True)
+    def test_connection_should_be_shared(self, m):
+        notifier = Mock(Notifier)
+        user = 'bart'
+        host = 'example.com'
+        port = 666
+        sut_1 = SshTarget(notifier, user, host, '/var/cache', port)
+        sut_2 = SshTarget(notifier, user, host, '/var/backup', port)
+        self.assertTrue(sut_1.is_available())
+        self.assertTrue(sut_2.is_available())
+        m.return_value.connect.assert_called_once_with(host, port, user, timeout=9)
 
 
 class SshTargetIntegrationTest(TestCase):
@@ -223,7 +420,7 @@ class FirstAvailableTargetTest(TestCase):
         target_1 = PathTarget(logger, notifier, '/tmp/SomeNoneExistentPath')
         target_2 = PathTarget(logger, notifier, '/tmp')
         target_3 = PathTarget(logger, notifier, '/tmp')
-        sut = FirstAvailableTarget([target_1, target_2, target_3])
+        sut = FirstAvailableTarget(notifier, [target_1, target_2, target_3])
         self.assertEquals(sut.to_rsync(), target_2.to_rsync())
         # Try again, so we cover the SUT's internal static cache.
         self.assertEquals(sut.to_rsync(), target_2.to_rsync())
@@ -234,8 +431,9 @@ class FirstAvailableTargetTest(TestCase):
         notifier = Mock(Notifier)
         target_1 = PathTarget(logger, notifier, '/tmp/SomeNoneExistentPath')
         target_2 = Mock(PathTarget)
+        target_2.check_availability.return_value = True, None
         target_3 = PathTarget(logger, notifier, '/tmp')
-        sut = FirstAvailableTarget([target_1, target_2, target_3])
+        sut = FirstAvailableTarget(notifier, [target_1, target_2, target_3])
         sut.snapshot(snapshot_name)
         target_2.snapshot.assert_called_with(snapshot_name)
         # Try again, so we cover the SUT's internal static cache.
@@ -248,18 +446,99 @@ class FirstAvailableTargetTest(TestCase):
         target_1 = PathTarget(logger, notifier, '/tmp/SomeNoneExistentPath')
         target_2 = PathTarget(logger, notifier, '/tmp')
         target_3 = PathTarget(logger, notifier, '/tmp')
-        sut = FirstAvailableTarget([target_1, target_2, target_3])
+        sut = FirstAvailableTarget(notifier, [target_1, target_2, target_3])
         self.assertTrue(sut.is_available())
         # Try again, so we cover the SUT's internal static cache.
         self.assertTrue(sut.is_available())
 
+    def test_is_available_should_prefer_earlier_targets(self):
+        notifier = Mock(Notifier)
+        target_1 = Mock(PathTarget)
+        target_1.check_availability.return_value = False, None
+        target_2 = Mock(PathTarget)
+        target_2.check_availability.side_effect = lambda: time.sleep(0.1) or (True, None)
+        target_3 = Mock(PathTarget)
+        target_3.check_availability.return_value = True, None
+        sut = FirstAvailableTarget(notifier, [target_1, target_2, target_3])
+        sut.snapshot('foo_bar')
+        target_2.snapshot.assert_called_once_with('foo_bar')
+        target_3.snapshot.assert_not_called()
+
+    def test_is_available_should_check_targets_concurrently(self):
+        notifier = Mock(Notifier)
+        target_2_checking = threading.Event()
+
+        def check_target_1_availability():
+            # Target 1 only becomes available once target 2 is being checked as well.
+            return target_2_checking.wait(9), None
+
+        def check_target_2_availability():
+            target_2_checking.set()
+            return True, None
+        target_1 = Mock(PathTarget)
+        target_1.check_availability.side_effect = check_target_1_availability
+        target_2 = Mock(PathTarget)
+        target_2.check_availability.side_effect = check_target_2_availability
+        sut = FirstAvailableTarget(notifier, [target_1, target_2])
+        sut.snapshot('foo_bar')
+        target_1.snapshot.assert_called_once_with('foo_bar')
+        target_2.snapshot.assert_not_called()
+
+    def test_is_available_should_alert_problems_of_earlier_targets_only(self):
+        notifier = Mock(Notifier)
+        target_1 = Mock(PathTarget)
+        target_1.check_availability.return_value = False, 'Target 1 is unavailable.'
+        target_2 = Mock(PathTarget)
+        target_2.check_availability.return_value = True, None
+        target_3 = Mock(PathTarget)
+        target_3.check_availability.return_value = False, 'Target 3 is unavailable.'
+        sut = FirstAvailableTarget(notifier, [target_1, target_2, target_3])
+        self.assertTrue(sut.is_available())
+        notifier.alert.assert_called_once_with('Target 1 is unavailable.')
+        target_1.is_available.assert_not_called()
+        target_3.is_available.assert_not_called()
+
+    def test_is_available_should_raise_errors(self):
+        notifier = Mock(Notifier)
+        target_1 = Mock(PathTarget)
+        target_1.check_availability.side_effect = IOError()
+        target_2 = Mock(PathTarget)
+        target_2.check_availability.return_value = True, None
+        sut = FirstAvailableTarget(notifier, [target_1, target_2])
+        with self.assertRaises(IOError):
+            sut.is_available()
+
     def test_is_available_unavailable(self):
         logger = getLogger(__name__)
         notifier = Mock(Notifier)
         target_1 = PathTarget(logger, notifier, '/tmp/SomeNoneExistentPath')
         target_2 = PathTarget(logger, notifier, '/tmp/SomeNoneExistentPath')
         target_3 = PathTarget(logger, notifier, '/tmp/SomeNoneExistentPath')
-        sut = FirstAvailableTarget([target_1, target_2, target_3])
+        sut = FirstAvailableTarget(notifier, [target_1, target_2, target_3])
         self.assertFalse(sut.is_available())
         # Try again, so we cover the SUT's internal static cache.
         self.assertFalse(sut.is_available())
+
+    def test_snapshot_many(self):
+        snapshot_names = ['foo_bar', 'baz_qux']
+        notifier = Mock(Notifier)
+        target = Mock(PathTarget)
+        target.check_availability.return_value = True, None
+        sut = FirstAvailableTarget(notifier, [target])
+        sut.snapshot_many(snapshot_names)
+        target.snapshot_many.assert_called_once_with(snapshot_names)
+
+    def test_close(self):
+        notifier = Mock(Notifier)
+        target_1 = Mock(PathTarget)
+        target_1.check_availability.return_value = True, None
+        target_2 = Mock(PathTarget)
+        checked = []
+        target_2.check_availability.side_effect = lambda: time.sleep(0.1) or checked.append(True) or (True, None)
+        sut = FirstAvailableTarget(notifier, iter([target_1, target_2]))
+        sut.is_available()
+        sut.close()
+        # Closing must wait for the targets that were still being checked.
+        self.assertEquals(checked, [True])
+        target_1.close.assert_called_once_with()
+        target_2.close.assert_called_once_with()
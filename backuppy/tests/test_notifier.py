@@ -9,7 +9,7 @@ except ImportError:
     from mock import patch, Mock, call
 
 from backuppy.notifier import NotifySendNotifier, GroupedNotifiers, CommandNotifier, FileNotifier, QuietNotifier, \
-    Notifier, StdioNotifier
+    Notifier, StdioNotifier, _DEVNULL, _reap
 
 
 class GroupedNotifiersTest(TestCase):
@@ -58,78 +58,98 @@ class GroupedNotifiersTest(TestCase):
         notifier_3.alert.assert_called_with(message)
 
 
-class CommandNotifierTest(TestCase):
-    @patch('subprocess.check_call')
-    def test_state(self, m):
+class PopenTestCase(TestCase):
+    """Patch subprocess.Popen, so notification commands are not actually run."""
+
+    def setUp(self):
+        popen_patch = patch('subprocess.Popen')
+        self.m_popen = popen_patch.start()
+        self.m_popen.return_value.wait.return_value = 0
+        self.addCleanup(popen_patch.stop)
+
+    def assert_popen_called_with(self, args):
+        self.m_popen.assert_called_with(args, stdin=_DEVNULL, stdout=_DEVNULL, stderr=_DEVNULL, close_fds=True)
+
+
+class CommandNotifierTest(PopenTestCase):
+    def test_state(self):
         state_args = ['some', 'state']
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(
             state_args=state_args + ['{message}'], fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.state(message)
-        m.assert_called_with(state_args + [message])
+        self.assert_popen_called_with(state_args + [message])
 
-    @patch('subprocess.check_call')
-    def test_state_should_fall_back(self, m):
+    def test_state_should_fall_back(self):
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.state(message)
-        m.assert_called_with(fallback_args + [message])
+        self.assert_popen_called_with(fallback_args + [message])
 
-    @patch('subprocess.check_call')
-    def test_inform(self, m):
+    def test_inform(self):
         inform_args = ['some', 'inform']
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(
             inform_args=inform_args + ['{message}'], fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.inform(message)
-        m.assert_called_with(inform_args + [message])
+        self.assert_popen_called_with(inform_args + [message])
 
-    @patch('subprocess.check_call')
-    def test_inform_should_fall_back(self, m):
+    def test_inform_should_fall_back(self):
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.inform(message)
-        m.assert_called_with(fallback_args + [message])
+        self.assert_popen_called_with(fallback_args + [message])
 
-    @patch('subprocess.check_call')
-    def test_confirm(self, m):
+    def test_confirm(self):
         confirm_args = ['some', 'confirm']
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(confirm_args=confirm_args +
                               ['{message}'], fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.confirm(message)
-        m.assert_called_with(confirm_args + [message])
+        self.assert_popen_called_with(confirm_args + [message])
 
-    @patch('subprocess.check_call')
-    def test_confirm_should_fall_back(self, m):
+    def test_confirm_should_fall_back(self):
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.confirm(message)
-        m.assert_called_with(fallback_args + [message])
+        self.assert_popen_called_with(fallback_args + [message])
 
-    @patch('subprocess.check_call')
-    def test_alert(self, m):
+    def test_alert(self):
         alert_args = ['some', 'alert']
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(
             alert_args=alert_args + ['{message}'], fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.alert(message)
-        m.assert_called_with(alert_args + [message])
+        self.assert_popen_called_with(alert_args + [message])
 
-    @patch('subprocess.check_call')
-    def test_alert_should_fall_back(self, m):
+    def test_alert_should_fall_back(self):
         fallback_args = ['some', 'fallback']
         sut = CommandNotifier(fallback_args=fallback_args + ['{message}'])
         message = 'Something happened!'
         sut.alert(message)
-        m.assert_called_with(fallback_args + [message])
+        self.assert_popen_called_with(fallback_args + [message])
+
+    @patch('logging.Logger.warning')
+    def test_reap_should_log_failed_commands(self, m_warning):
+        process = Mock()
+        process.wait.return_value = 1
+        _reap(process, ['some', 'fallback', 'Something happened!'])
+        m_warning.assert_called_once_with(
+            'Notification command `some fallback Something happened!` exited with status 1.')
+
+    @patch('logging.Logger.warning')
+    def test_reap_should_not_log_successful_commands(self, m_warning):
+        process = Mock()
+        process.wait.return_value = 0
+        _reap(process, ['some', 'fallback', 'Something happened!'])
+        m_warning.assert_not_called()
 
     def test_init_without_state_and_fallback(self):
         inform_args = ['some', 'inform']
@@ -164,37 +184,33 @@ class CommandNotifierTest(TestCase):
                             inform_args=inform_args, confirm_args=confirm_args)
 
 
-class NotifySendNotifierTest(TestCase):
-    @patch('subprocess.check_call')
-    def test_state(self, m):
+class NotifySendNotifierTest(PopenTestCase):
+    def test_state(self):
         sut = NotifySendNotifier()
         message = 'Something happened!'
         sut.state(message)
-        m.assert_called_with(
+        self.assert_popen_called_with(
             ['notify-send', '-c', 'backuppy', '-u', 'low', message])
 
-    @patch('subprocess.check_call')
-    def test_inform(self, m):
+    def test_inform(self):
         sut = NotifySendNotifier()
         message = 'Something happened!'
         sut.inform(message)
-        m.assert_called_with(
+        self.assert_popen_called_with(
             ['notify-send', '-c', 'backuppy', '-u', 'normal', message])
 
-    @patch('subprocess.check_call')
-    def test_confirm(self, m):
+    def test_confirm(self):
         sut = NotifySendNotifier()
         message = 'Something happened!'
         sut.confirm(message)
-        m.assert_called_with(
+        self.assert_popen_called_with(
             ['notify-send', '-c', 'backuppy', '-u', 'normal', message])
 
-    @patch('subprocess.check_call')
-    def test_alert(self, m):
+    def test_alert(self):
         sut = NotifySendNotifier()
         message = 'Something happened!'
         sut.alert(message)
-        m.assert_called_with(
+        self.assert_popen_called_with(
             ['notify-send', '-c', 'backuppy', '-u', 'critical', message])
 
 
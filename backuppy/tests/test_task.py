@@ -1,3 +1,4 @@
+import filecmp
 import os
 import subprocess
 import time
@@ -6,7 +7,7 @@ from unittest import TestCase
 from parameterized import parameterized
 
 from backuppy.location import PathSource, PathTarget
-from backuppy.task import backup, restore
+from backuppy.task import backup, restore, rsync, rsync_many, backup_many
 from backuppy.tests import assert_paths_identical, build_files_stage_1, build_files_stage_2
 
 try:
@@ -23,6 +24,38 @@ from backuppy.config import Configuration
 from backuppy.notifier import Notifier
 
 
+class RsyncTest(TestCase):
+    @patch('subprocess.check_call')
+    def test_rsync_with_ssh_options(self, m):
+        configuration = Mock(Configuration)
+        configuration.verbose = False
+        configuration.ssh_options.return_value = {
+            'Port': '22',
+        }
+        origin = Mock(PathSource)
+        origin.to_rsync.return_value = '/foo/'
+        destination = Mock(PathTarget)
+        destination.to_rsync.return_value = '/bar/latest/'
+        rsync(configuration, origin, destination)
+        m.assert_called_once_with(['rsync', '-ar', '--numeric-ids', '--relative', '-e', 'ssh -o Port=22', '/foo/./',
+                                   '/bar/latest/'])
+
+    @patch('subprocess.Popen')
+    def test_rsync_many(self, m):
+        m.return_value.returncode = 0
+        configuration = Mock(Configuration)
+        configuration.verbose = False
+        configuration.ssh_options.return_value = {}
+        origin = Mock(PathSource)
+        origin.to_rsync.return_value = '/foo/'
+        destination = Mock(PathTarget)
+        destination.to_rsync.return_value = '/bar/latest/'
+        rsync_many(configuration, origin, destination, ['some.file', 'some\nother.file'])
+        m.assert_called_once_with(['rsync', '-ar', '--numeric-ids', '--relative', '--from0', '--files-from=-',
+                                   '/foo/', '/bar/latest/'], stdin=subprocess.PIPE)
+        m.return_value.communicate.assert_called_once_with(b'some.file\0some\nother.file')
+
+
 class BackupTest(TestCase):
     def test_backup_all(self):
         # Create the source directory.
@@ -171,6 +204,30 @@ class BackupTest(TestCase):
                         self, source_path, real_snapshot_1_path)
                 assert_paths_identical(self, os.path.join(real_snapshot_1_path, path), os.path.join(source_path, path))
 
+    def test_backup_many(self):
+        paths = ['some.file', 'sub/some.file.in.subdirectory']
+        # Create the source directory.
+        with TemporaryDirectory() as source_path:
+            build_files_stage_1(source_path)
+            build_files_stage_2(source_path)
+
+            # Create the target directory.
+            with TemporaryDirectory() as target_path:
+                configuration = Configuration('Foo', verbose=True)
+                configuration.notifier = Mock(Notifier)
+                configuration.source = PathSource(
+                    configuration.logger, configuration.notifier, source_path + '/')
+                configuration.target = PathTarget(
+                    configuration.logger, configuration.notifier, target_path)
+
+                result = backup_many(configuration, paths)
+                self.assertTrue(result)
+                for path in paths:
+                    target_file_path = os.path.join(target_path, 'latest', path)
+                    self.assertTrue(os.path.isfile(target_file_path))
+                    self.assertTrue(filecmp.cmp(os.path.join(source_path, path), target_file_path, shallow=False))
+                self.assertFalse(os.path.exists(os.path.join(target_path, 'latest', 'some.later.file')))
+
     def test_backup_with_unavailable_source(self):
         # Create the source directory.
         with TemporaryDirectory() as source_path: